@@ -13,6 +13,7 @@ from .constants import (
     DEFAULT_OUTLIER_THRESHOLD,
     DEFAULT_REBALANCE_BATCH_SIZE,
     DEFAULT_REBALANCE_LOWER_RATIO,
+    DEFAULT_REBALANCE_MAX_CONCURRENCY,
     DEFAULT_REBALANCE_TRANSITIONS,
     DEFAULT_TIMEOUT_SECONDS,
     ensure_output_dir,
@@ -131,6 +132,7 @@ def main(argv: list[str] | None = None) -> int:
                 output_csv_path=Path(args.output_csv),
                 batch_size=args.batch_size,
                 lower_ratio=args.lower_ratio,
+                max_concurrency=args.max_concurrency,
                 max_retries=args.max_retries,
                 timeout_seconds=args.timeout_seconds,
                 max_tokens=args.max_tokens,
@@ -377,6 +379,7 @@ def _add_step5_args(parser: argparse.ArgumentParser) -> None:
     parser.add_argument("--output-csv", required=True)
     parser.add_argument("--batch-size", type=int, default=DEFAULT_REBALANCE_BATCH_SIZE)
     parser.add_argument("--lower-ratio", type=float, default=DEFAULT_REBALANCE_LOWER_RATIO)
+    parser.add_argument("--max-concurrency", type=int, default=DEFAULT_REBALANCE_MAX_CONCURRENCY)
     parser.add_argument("--max-retries", type=int, default=DEFAULT_MAX_RETRIES)
     parser.add_argument("--timeout-seconds", type=int, default=DEFAULT_TIMEOUT_SECONDS)
     parser.add_argument("--max-tokens", type=int, default=DEFAULT_MAX_TOKENS)
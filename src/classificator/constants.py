@@ -28,6 +28,7 @@ FALLBACK_RARITY_LEVEL = 4
 DEFAULT_REBALANCE_BATCH_SIZE = 600
 DEFAULT_REBALANCE_LOWER_RATIO = 1.0 / 3.0
 DEFAULT_REBALANCE_TRANSITIONS = "2:1,3:2,4:3"
+DEFAULT_REBALANCE_MAX_CONCURRENCY = 1
 
 REBALANCE_FROM_LEVEL_PLACEHOLDER = "{{FROM_LEVEL}}"
 REBALANCE_TO_LEVEL_PLACEHOLDER = "{{TO_LEVEL}}"
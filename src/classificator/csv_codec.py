@@ -2,8 +2,14 @@ from __future__ import annotations
 
 import csv
 import os
+from collections.abc import Iterable, Iterator, Sequence
+from contextlib import contextmanager
 from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
+
+_READ_BUFFER_BYTES = 1 << 20
+_WRITE_BUFFER_BYTES = 1 << 20
 
 
 class CsvFormatError(RuntimeError):
@@ -22,48 +28,90 @@ class CsvTable:
     records: list[CsvRecord]
 
 
+@dataclass(frozen=True)
+class CsvStream:
+    headers: list[str]
+    records: Iterator[CsvRecord]
+
+
 class CsvCodec:
     def read_table(self, path: Path) -> CsvTable:
+        with self.stream_table(path) as stream:
+            return CsvTable(headers=stream.headers, records=list(stream.records))
+
+    @contextmanager
+    def stream_table(self, path: Path) -> Iterator[CsvStream]:
         if not path.exists():
             raise FileNotFoundError(f"CSV file not found: {path}")
 
-        with path.open("r", encoding="utf-8", newline="") as handle:
-            reader = csv.reader(handle)
-            rows = list(reader)
+        with path.open("r", encoding="utf-8", newline="", buffering=_READ_BUFFER_BYTES) as handle:
+            yield self.stream_from(handle, path)
 
-        if not rows:
-            raise CsvFormatError(f"CSV file is empty: {path}")
+    def stream_from(self, handle: Iterable[str], source: Path) -> CsvStream:
+        # Parses any line source; source only labels error messages.
+        reader = csv.reader(handle)
+        first = next(reader, None)
+        if first is None:
+            raise CsvFormatError(f"CSV file is empty: {source}")
 
-        headers = [str(x) for x in rows[0]]
+        headers = [str(x) for x in first]
         if not headers:
-            raise CsvFormatError(f"CSV has empty header row: {path}")
+            raise CsvFormatError(f"CSV has empty header row: {source}")
 
-        records: list[CsvRecord] = []
-        for i, row in enumerate(rows[1:], start=2):
+        return CsvStream(headers=headers, records=self._iter_records(source, headers, reader))
+
+    def _iter_records(self, path: Path, headers: list[str], reader: Iterator[list[str]]) -> Iterator[CsvRecord]:
+        width = len(headers)
+        for i, row in enumerate(reader, start=2):
             if len(row) == 1 and row[0] == "":
                 continue
-            if len(row) != len(headers):
+            if len(row) != width:
                 raise CsvFormatError(
-                    f"CSV {path} line {i} has {len(row)} columns, expected {len(headers)}"
+                    f"CSV {path} line {i} has {len(row)} columns, expected {width}"
                 )
-            records.append(CsvRecord(line_number=i, values=[str(x) for x in row]))
-
-        return CsvTable(headers=headers, records=records)
+            yield CsvRecord(line_number=i, values=row)
 
-    def write_table(self, path: Path, headers: list[str], rows: list[list[str]]) -> None:
+    def write_table(self, path: Path, headers: list[str], rows: Sequence[Sequence[object]]) -> None:
         path.parent.mkdir(parents=True, exist_ok=True)
-        with path.open("w", encoding="utf-8", newline="") as handle:
+        width = len(headers)
+        for row in rows:
+            if len(row) != width:
+                raise CsvFormatError(
+                    f"Attempted to write {len(row)} columns, expected {width}"
+                )
+        with path.open("w", encoding="utf-8", newline="", buffering=_WRITE_BUFFER_BYTES) as handle:
             writer = csv.writer(handle, quoting=csv.QUOTE_ALL)
             writer.writerow(headers)
+            writer.writerows(rows)
+
+    def write_table_atomic(self, path: Path, headers: list[str], rows: Iterable[Sequence[object]]) -> None:
+        with self.open_table_writer(path, headers) as sink:
             for row in rows:
-                if len(row) != len(headers):
-                    raise CsvFormatError(
-                        f"Attempted to write {len(row)} columns, expected {len(headers)}"
-                    )
-                writer.writerow(row)
+                sink.write(row)
 
-    def write_table_atomic(self, path: Path, headers: list[str], rows: list[list[str]]) -> None:
+    @contextmanager
+    def open_table_writer(self, path: Path, headers: list[str]) -> Iterator[CsvRowSink]:
         path.parent.mkdir(parents=True, exist_ok=True)
         tmp = path.with_name(f"{path.name}.tmp")
-        self.write_table(tmp, headers, rows)
-        os.replace(tmp, path)
+        try:
+            with tmp.open("w", encoding="utf-8", newline="", buffering=_WRITE_BUFFER_BYTES) as handle:
+                writer = csv.writer(handle, quoting=csv.QUOTE_ALL)
+                writer.writerow(headers)
+                yield CsvRowSink(writer, len(headers))
+            os.replace(tmp, path)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+
+
+class CsvRowSink:
+    def __init__(self, writer: Any, width: int) -> None:
+        self._writer = writer
+        self._width = width
+
+    def write(self, row: Sequence[object]) -> None:
+        if len(row) != self._width:
+            raise CsvFormatError(
+                f"Attempted to write {len(row)} columns, expected {self._width}"
+            )
+        self._writer.writerow(row)
@@ -1,15 +1,26 @@
 from __future__ import annotations
 
+from collections import Counter
+from collections.abc import Iterable, Mapping
+
 
 class RarityDistribution:
     def __init__(self) -> None:
         self._counts = [0, 0, 0, 0, 0, 0]
 
     @classmethod
-    def from_levels(cls, levels: list[int] | tuple[int, ...] | set[int]) -> "RarityDistribution":
+    def from_levels(cls, levels: Iterable[int]) -> "RarityDistribution":
         d = cls()
-        for level in levels:
-            d.increment(level)
+        tally = Counter(levels)
+        for level in range(1, 6):
+            d._counts[level] = tally.get(level, 0)
+        return d
+
+    @classmethod
+    def from_counts(cls, counts: Mapping[int, int]) -> "RarityDistribution":
+        d = cls()
+        for level in range(1, 6):
+            d._counts[level] = counts.get(level, 0)
         return d
 
     def increment(self, level: int) -> None:
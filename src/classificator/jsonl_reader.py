@@ -0,0 +1,22 @@
+from __future__ import annotations
+
+from collections.abc import Iterator
+from pathlib import Path
+
+_READ_CHUNK_BYTES = 1 << 20
+
+
+def iter_jsonl_lines(path: Path, offset: int = 0) -> Iterator[bytes]:
+    with path.open("rb") as handle:
+        handle.seek(offset)
+        pending = b""
+        while chunk := handle.read(_READ_CHUNK_BYTES):
+            lines = (pending + chunk).split(b"\n")
+            pending = lines.pop()
+            for line in lines:
+                line = line.strip()
+                if line:
+                    yield line
+        pending = pending.strip()
+        if pending:
+            yield pending
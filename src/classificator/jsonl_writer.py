@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import TextIO
+
+
+class JsonlWriter:
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._handle: TextIO | None = None
+
+    def write(self, payload: dict[str, object]) -> None:
+        self._open().write(json.dumps(payload, ensure_ascii=False) + "\n")
+
+    def append_file(self, path: Path) -> None:
+        # Moves JSONL records that another writer spooled to `path` into this log.
+        try:
+            with path.open("r", encoding="utf-8") as source:
+                content = source.read()
+        except FileNotFoundError:
+            return
+        if content:
+            self._open().write(content)
+        path.unlink()
+
+    def flush(self) -> None:
+        if self._handle is not None:
+            self._handle.flush()
+
+    def close(self) -> None:
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+    def _open(self) -> TextIO:
+        if self._handle is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._handle = self.path.open("a", encoding="utf-8")
+        return self._handle
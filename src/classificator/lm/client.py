@@ -2,6 +2,7 @@ from __future__ import annotations
 
 import json
 import socket
+import threading
 import time
 from dataclasses import dataclass, replace
 from datetime import datetime, timezone
@@ -77,6 +78,9 @@ class ScoringContext:
     expected_json_items: int | None = None
     output_mode: ScoringOutputMode = ScoringOutputMode.SCORE_RESULTS
     forced_rarity_level: int | None = None
+    # When set, status messages are collected here instead of printed, so a caller
+    # scoring on worker threads can print them in its own order.
+    notices: list[str] | None = None
 
 
 @dataclass(frozen=True)
@@ -99,6 +103,8 @@ class LmStudioClient:
         self.request_builder = request_builder or LmStudioRequestBuilder()
         self.response_parser = response_parser or LmStudioResponseParser(metrics=metrics)
         self.capability_state = CapabilityState()
+        # Step5 scores batches from worker threads; capability downgrades are shared.
+        self._capability_lock = threading.Lock()
         self._requests = _load_requests()
 
     def resolve_endpoint(self, endpoint_option: str | None, base_url_option: str | None) -> ResolvedEndpoint:
@@ -257,7 +263,7 @@ class LmStudioClient:
                     )
                 )
                 if disable_after_partial:
-                    self._mark_response_format_disabled()
+                    self._mark_response_format_disabled(ctx)
                     response_format_mode = ResponseFormatMode.NONE
 
                 self._append_json_line(
@@ -331,20 +337,20 @@ class LmStudioClient:
                 )
 
                 if should_switch_schema:
-                    self._mark_response_format_json_schema()
+                    self._mark_response_format_json_schema(ctx)
                     response_format_mode = ResponseFormatMode.JSON_SCHEMA
                 elif unsupported_response_format or empty_parsed:
-                    self._mark_response_format_disabled()
+                    self._mark_response_format_disabled(ctx)
                     response_format_mode = ResponseFormatMode.NONE
 
                 if unsupported_reasoning_controls:
-                    self._mark_reasoning_controls_unsupported()
+                    self._mark_reasoning_controls_unsupported(ctx)
                     include_reasoning_controls = False
 
                 if model_crash:
                     time.sleep(MODEL_CRASH_BACKOFF_SECONDS * (attempt + 1))
 
-        print(f"Batch failed after retries (size={len(batch)}): {last_error}")
+        _notify(ctx, f"Batch failed after retries (size={len(batch)}): {last_error}")
         return BatchAttempt(
             scores=[],
             unresolved=batch,
@@ -373,7 +379,9 @@ class LmStudioClient:
         if len(repaired.scores) != expected:
             return None
 
-        print(f"Selection repair succeeded (size={len(batch)}, expected={expected}), avoiding recursive split.")
+        _notify(
+            ctx, f"Selection repair succeeded (size={len(batch)}, expected={expected}), avoiding recursive split."
+        )
         return repaired.scores
 
     def _resolve_selection_prompt_counts(self, ctx: ScoringContext) -> tuple[str, str]:
@@ -406,20 +414,27 @@ class LmStudioClient:
             return False
         return self.capability_state.reasoning_controls_supported
 
-    def _mark_response_format_json_schema(self) -> None:
-        if self.capability_state.response_format_mode != ResponseFormatMode.JSON_SCHEMA:
+    def _mark_response_format_json_schema(self, ctx: ScoringContext) -> None:
+        with self._capability_lock:
+            # Only upgrade from the default; never re-enable a format another batch disabled.
+            if self.capability_state.response_format_mode != ResponseFormatMode.JSON_OBJECT:
+                return
             self.capability_state = replace(self.capability_state, response_format_mode=ResponseFormatMode.JSON_SCHEMA)
-            print("LM capability: switching response_format to json_schema for this run.")
+        _notify(ctx, "LM capability: switching response_format to json_schema for this run.")
 
-    def _mark_response_format_disabled(self) -> None:
-        if self.capability_state.response_format_mode != ResponseFormatMode.NONE:
+    def _mark_response_format_disabled(self, ctx: ScoringContext) -> None:
+        with self._capability_lock:
+            if self.capability_state.response_format_mode == ResponseFormatMode.NONE:
+                return
             self.capability_state = replace(self.capability_state, response_format_mode=ResponseFormatMode.NONE)
-            print("LM capability: disabling response_format for this run.")
+        _notify(ctx, "LM capability: disabling response_format for this run.")
 
-    def _mark_reasoning_controls_unsupported(self) -> None:
-        if self.capability_state.reasoning_controls_supported:
+    def _mark_reasoning_controls_unsupported(self, ctx: ScoringContext) -> None:
+        with self._capability_lock:
+            if not self.capability_state.reasoning_controls_supported:
+                return
             self.capability_state = replace(self.capability_state, reasoning_controls_supported=False)
-            print("LM capability: disabling reasoning controls for this run.")
+        _notify(ctx, "LM capability: disabling reasoning controls for this run.")
 
     def _resolve_explicit_endpoint(self, endpoint: str, path: str) -> ResolvedEndpoint | None:
         if "/api/v1/chat" in path:
@@ -503,9 +518,16 @@ class LmStudioClient:
 
     def _append_json_line(self, path: Path, payload: dict[str, Any]) -> None:
         path.parent.mkdir(parents=True, exist_ok=True)
+        # One write per record, so appends to a shared log never interleave mid-line.
         with path.open("a", encoding="utf-8") as handle:
-            handle.write(json.dumps(payload, ensure_ascii=False))
-            handle.write("\n")
+            handle.write(json.dumps(payload, ensure_ascii=False) + "\n")
+
+
+def _notify(ctx: ScoringContext, message: str) -> None:
+    if ctx.notices is None:
+        print(message)
+    else:
+        ctx.notices.append(message)
 
 
 def _compute_split_expected(total_expected: int, left_size: int, total_size: int) -> int:
@@ -1,10 +1,13 @@
 from __future__ import annotations
 
 import csv
+from collections.abc import Iterable, Sequence
+from contextlib import AbstractContextManager
+from operator import attrgetter
 from pathlib import Path
 
 from .constants import BASE_CSV_HEADERS, RUN_CSV_HEADERS
-from .csv_codec import CsvCodec, CsvFormatError, CsvTable
+from .csv_codec import CsvCodec, CsvFormatError, CsvRowSink, CsvStream, CsvTable
 from .models import BaseWordRow, RunBaseline, RunCsvRow
 from .support import required_columns
 
@@ -26,7 +29,7 @@ class RunCsvRepository:
                     type=self._require_non_blank(path, rec.line_number, row, "type"),
                 )
             )
-        return sorted(out, key=lambda r: r.word_id)
+        return sorted(out, key=attrgetter("word_id"))
 
     def load_run_rows(self, path: Path) -> list[RunCsvRow]:
         if not path.exists():
@@ -57,7 +60,7 @@ class RunCsvRepository:
             )
             by_id[parsed.word_id] = parsed
 
-        return sorted(by_id.values(), key=lambda r: r.word_id)
+        return sorted(by_id.values(), key=attrgetter("word_id"))
 
     def append_run_rows(self, path: Path, rows: list[RunCsvRow]) -> None:
         if not rows:
@@ -83,47 +86,62 @@ class RunCsvRepository:
         merged = {r.word_id: r for r in self.load_run_rows(path)}
         for row in in_memory_rows:
             merged[row.word_id] = row
-        merged_rows = sorted(merged.values(), key=lambda r: r.word_id)
+        merged_rows = sorted(merged.values(), key=attrgetter("word_id"))
         self._assert_not_shrunk(path, merged_rows, baseline)
         self.rewrite_run_rows_atomic(path, merged_rows)
 
     def rewrite_run_rows_atomic(self, path: Path, rows: list[RunCsvRow]) -> None:
-        body = [self._serialize_for_headers(r, RUN_CSV_HEADERS) for r in sorted(rows, key=lambda r: r.word_id)]
+        body = [self._serialize_for_headers(r, RUN_CSV_HEADERS) for r in sorted(rows, key=attrgetter("word_id"))]
         self.csv.write_table_atomic(path, RUN_CSV_HEADERS, body)
 
     def load_final_levels(self, path: Path) -> dict[int, int]:
-        table = self.csv.read_table(path)
-        if "word_id" not in table.headers:
-            raise ValueError(f"CSV {path} missing required column 'word_id'")
-
-        if "final_level" in table.headers:
-            level_col = "final_level"
-        elif "rarity_level" in table.headers:
-            level_col = "rarity_level"
-        elif "median_level" in table.headers:
-            level_col = "median_level"
-        else:
-            raise ValueError("CSV must contain one of: final_level, rarity_level, median_level")
-
-        out: dict[int, int] = {}
-        for rec in table.records:
-            row = dict(zip(table.headers, rec.values))
-            word_id = self._parse_int(path, rec.line_number, row, "word_id")
-            level = self._parse_int(path, rec.line_number, row, level_col)
-            if level < 1 or level > 5:
-                raise CsvFormatError(f"{level_col} out of range at {path}:{rec.line_number}")
-            out[word_id] = level
+        with self.csv.stream_table(path) as stream:
+            headers = stream.headers
+            if "word_id" not in headers:
+                raise ValueError(f"CSV {path} missing required column 'word_id'")
+
+            if "final_level" in headers:
+                level_col = "final_level"
+            elif "rarity_level" in headers:
+                level_col = "rarity_level"
+            elif "median_level" in headers:
+                level_col = "median_level"
+            else:
+                raise ValueError("CSV must contain one of: final_level, rarity_level, median_level")
+
+            idx_word_id = headers.index("word_id")
+            idx_level = headers.index(level_col)
+            out: dict[int, int] = {}
+            for rec in stream.records:
+                vals = rec.values
+                try:
+                    word_id = int(vals[idx_word_id])
+                except Exception as exc:
+                    raise CsvFormatError(f"Invalid word_id at {path}:{rec.line_number}") from exc
+                try:
+                    level = int(vals[idx_level])
+                except Exception as exc:
+                    raise CsvFormatError(f"Invalid {level_col} at {path}:{rec.line_number}") from exc
+                if level < 1 or level > 5:
+                    raise CsvFormatError(f"{level_col} out of range at {path}:{rec.line_number}")
+                out[word_id] = level
         return out
 
-    def write_rows(self, path: Path, headers: list[str], rows: list[list[str]]) -> None:
+    def write_rows(self, path: Path, headers: list[str], rows: Sequence[Sequence[object]]) -> None:
         self.csv.write_table(path, headers, rows)
 
     def read_table(self, path: Path) -> CsvTable:
         return self.csv.read_table(path)
 
-    def write_table_atomic(self, path: Path, headers: list[str], rows: list[list[str]]) -> None:
+    def stream_table(self, path: Path) -> AbstractContextManager[CsvStream]:
+        return self.csv.stream_table(path)
+
+    def write_table_atomic(self, path: Path, headers: list[str], rows: Iterable[Sequence[object]]) -> None:
         self.csv.write_table_atomic(path, headers, rows)
 
+    def open_table_writer(self, path: Path, headers: list[str]) -> AbstractContextManager[CsvRowSink]:
+        return self.csv.open_table_writer(path, headers)
+
     def _serialize_for_headers(self, row: RunCsvRow, headers: list[str]) -> list[str]:
         base = {
             "word_id": str(row.word_id),
@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
+from operator import attrgetter
 from pathlib import Path
 
 from ..constants import BASE_CSV_HEADERS
@@ -14,7 +15,7 @@ class Step1Options:
 
 
 def run_step1(options: Step1Options, *, word_store: WordStore, repo: RunCsvRepository) -> Path:
-    words = sorted(word_store.fetch_all_words(), key=lambda w: w.word_id)
+    words = sorted(word_store.fetch_all_words(), key=attrgetter("word_id"))
     rows = [[str(w.word_id), w.word, w.type] for w in words]
     repo.write_rows(options.output_csv_path, BASE_CSV_HEADERS, rows)
     print(f"Step 1 complete. Exported {len(words)} words to {options.output_csv_path}")
@@ -5,6 +5,7 @@ import os
 import socket
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from operator import attrgetter
 from pathlib import Path
 
 from ..batch_size_adapter import BatchSizeAdapter
@@ -109,7 +110,7 @@ def _prepare_files(output_dir: Path, run_slug: str) -> Step2Files:
 
 def _build_context(options: Step2Options, repo: RunCsvRepository) -> Step2Context:
     source_csv = options.input_csv_path or options.base_csv_path
-    base_rows = sorted({r.word_id: r for r in repo.load_base_rows(source_csv)}.values(), key=lambda r: r.word_id)
+    base_rows = sorted({r.word_id: r for r in repo.load_base_rows(source_csv)}.values(), key=attrgetter("word_id"))
     existing_rows = {r.word_id: r for r in repo.load_run_rows(options.output_csv_path)}
 
     pending = [row for row in base_rows if options.force or row.word_id not in existing_rows]
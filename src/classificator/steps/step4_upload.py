@@ -11,6 +11,9 @@ from ..run_csv_repository import RunCsvRepository
 from ..upload_marker_writer import UploadMarkerWriter
 from ..word_store import WordStore
 
+# word_id, db level, uploaded level, source; the CSV writer stringifies ints.
+ReportRow = tuple[int, int | str, int | str, str]
+
 
 @dataclass(frozen=True)
 class Step4Options:
@@ -24,10 +27,10 @@ def run_step4(options: Step4Options, *, word_store: WordStore, repo: RunCsvRepos
     final_levels = repo.load_final_levels(options.final_csv_path)
     db_levels = {wl.word_id: wl for wl in word_store.fetch_all_word_levels()}
 
-    input_dist = RarityDistribution.from_levels(list(final_levels.values()))
+    input_dist = RarityDistribution.from_levels(final_levels.values())
     updates, report_rows, status_by_word_id = _build_upload_plan(options.mode, final_levels, db_levels)
 
-    uploaded_dist = RarityDistribution.from_levels(list(updates.values()))
+    uploaded_dist = RarityDistribution.from_levels(updates.values())
     word_store.update_rarity_levels_chunked(updates)
     repo.write_rows(options.report_path, UPLOAD_REPORT_HEADERS, report_rows)
 
@@ -52,7 +55,7 @@ def _build_upload_plan(
     mode: UploadMode,
     final_levels: dict[int, int],
     db_levels: dict[int, WordLevel],
-) -> tuple[dict[int, int], list[list[str]], dict[int, str]]:
+) -> tuple[dict[int, int], list[ReportRow], dict[int, str]]:
     if mode == UploadMode.PARTIAL:
         return _build_partial_plan(final_levels, db_levels)
     return _build_full_fallback_plan(final_levels, db_levels)
@@ -61,20 +64,28 @@ def _build_upload_plan(
 def _build_partial_plan(
     final_levels: dict[int, int],
     db_levels: dict[int, WordLevel],
-) -> tuple[dict[int, int], list[list[str]], dict[int, str]]:
+) -> tuple[dict[int, int], list[ReportRow], dict[int, str]]:
     updates: dict[int, int] = {}
-    report_rows: list[list[str]] = []
+    report_rows: list[ReportRow] = []
     status: dict[int, str] = {}
 
+    if not (final_levels.keys() - db_levels.keys()):
+        # Common case: every final word exists in the DB, so skip the per-row miss check.
+        for word_id, level in sorted(final_levels.items()):
+            updates[word_id] = level
+            report_rows.append((word_id, db_levels[word_id].rarity_level, level, "final_csv"))
+            status[word_id] = "uploaded"
+        return updates, report_rows, status
+
     for word_id, level in sorted(final_levels.items()):
         existing = db_levels.get(word_id)
         if existing is None:
-            report_rows.append([str(word_id), "", "", "missing_db_word"])
+            report_rows.append((word_id, "", "", "missing_db_word"))
             status[word_id] = "missing_db_word"
             continue
 
         updates[word_id] = level
-        report_rows.append([str(word_id), str(existing.rarity_level), str(level), "final_csv"])
+        report_rows.append((word_id, existing.rarity_level, level, "final_csv"))
         status[word_id] = "uploaded"
 
     return updates, report_rows, status
@@ -83,16 +94,22 @@ def _build_partial_plan(
 def _build_full_fallback_plan(
     final_levels: dict[int, int],
     db_levels: dict[int, WordLevel],
-) -> tuple[dict[int, int], list[list[str]], dict[int, str]]:
+) -> tuple[dict[int, int], list[ReportRow], dict[int, str]]:
     updates: dict[int, int] = {}
-    report_rows: list[list[str]] = []
-
-    for existing in sorted(db_levels.values(), key=lambda x: x.word_id):
-        in_final = existing.word_id in final_levels
-        new_level = final_levels.get(existing.word_id, FALLBACK_RARITY_LEVEL)
-        source = "final_csv" if in_final else "fallback_4"
-        updates[existing.word_id] = new_level
-        report_rows.append([str(existing.word_id), str(existing.rarity_level), str(new_level), source])
+    report_rows: list[ReportRow] = []
+    lookup_final = final_levels.get
+    append_row = report_rows.append
+
+    for wid in sorted(db_levels):
+        existing = db_levels[wid]
+        new_level = lookup_final(wid)
+        if new_level is None:
+            new_level = FALLBACK_RARITY_LEVEL
+            source = "fallback_4"
+        else:
+            source = "final_csv"
+        updates[wid] = new_level
+        append_row((wid, existing.rarity_level, new_level, source))
 
     status = {
         word_id: ("uploaded" if word_id in db_levels else "missing_db_word")
@@ -1,29 +1,45 @@
 from __future__ import annotations
 
 import json
+import os
+import pickle
 import random
-from dataclasses import dataclass
+import sys
+from collections import deque
+from collections.abc import Iterable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field, replace
 from datetime import datetime, timezone
 from pathlib import Path
+from typing import NoReturn
 
 from ..constants import (
     DEFAULT_MAX_RETRIES,
     DEFAULT_MAX_TOKENS,
     DEFAULT_REBALANCE_BATCH_SIZE,
     DEFAULT_REBALANCE_LOWER_RATIO,
+    DEFAULT_REBALANCE_MAX_CONCURRENCY,
     DEFAULT_TIMEOUT_SECONDS,
     REBALANCE_COMMON_LEVEL_PLACEHOLDER,
     REBALANCE_FROM_LEVEL_PLACEHOLDER,
     REBALANCE_OTHER_LEVEL_PLACEHOLDER,
     REBALANCE_TO_LEVEL_PLACEHOLDER,
 )
-from ..csv_codec import CsvFormatError
+from ..csv_codec import CsvFormatError, CsvRecord
 from ..distribution import RarityDistribution
+from ..jsonl_reader import iter_jsonl_lines
+from ..jsonl_writer import JsonlWriter
 from ..lm.client import LmStudioClient, ScoringContext
 from ..models import BaseWordRow, ResolvedEndpoint, ScoreResult, ScoringOutputMode
 from ..run_csv_repository import RunCsvRepository
+from ..support import VALID_LEVELS, parse_id_level_columns
 from ..transitions import LevelTransition, validate_transition_set
 
+REBALANCE_OUTPUT_COLUMNS = ("final_level", "rebalance_rule", "rebalance_model", "rebalance_run", "rebalanced_at")
+_CHECKPOINT_STATE_VERSION = 1
+_CHECKPOINT_STATE_EVERY = 32
+_CHECKPOINT_STATE_TAIL_BYTES = 256
+
 
 @dataclass(frozen=True)
 class Step5Options:
@@ -33,6 +49,7 @@ class Step5Options:
     output_csv_path: Path
     batch_size: int = DEFAULT_REBALANCE_BATCH_SIZE
     lower_ratio: float = DEFAULT_REBALANCE_LOWER_RATIO
+    max_concurrency: int = DEFAULT_REBALANCE_MAX_CONCURRENCY
     max_retries: int = DEFAULT_MAX_RETRIES
     timeout_seconds: int = DEFAULT_TIMEOUT_SECONDS
     max_tokens: int = DEFAULT_MAX_TOKENS
@@ -45,7 +62,7 @@ class Step5Options:
     user_template: str = ""
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RebalanceWord:
     word_id: int
     word: str
@@ -55,9 +72,11 @@ class RebalanceWord:
 @dataclass
 class RebalanceDataset:
     input_headers: list[str]
-    mutable_rows: list[dict[str, str]]
+    input_rows: list[list[str]]
+    row_word_ids: list[int]
     words_by_id: dict[int, RebalanceWord]
     levels_by_id: dict[int, int]
+    words_by_level: dict[int, list[RebalanceWord]]
 
 
 @dataclass
@@ -66,15 +85,60 @@ class RebalanceRuntime:
     distribution: RarityDistribution
     rebalance_rules: dict[int, str]
     processed_word_ids: set[int]
+    checkpoint_batches: int = 0
+    unprocessed_by_level: dict[int, list[RebalanceWord]] = field(default_factory=dict)
 
 
-@dataclass(frozen=True)
+@dataclass
 class Step5Logs:
     run_log_path: Path
     failed_log_path: Path
     switched_words_log_path: Path
     checkpoint_path: Path
     progress_log_path: Path
+    run_log: JsonlWriter = field(init=False, repr=False)
+    failed_log: JsonlWriter = field(init=False, repr=False)
+    switched_words_log: JsonlWriter = field(init=False, repr=False)
+    checkpoint_log: JsonlWriter = field(init=False, repr=False)
+    progress_log: JsonlWriter = field(init=False, repr=False)
+
+    def __post_init__(self) -> None:
+        self.run_log = JsonlWriter(self.run_log_path)
+        self.failed_log = JsonlWriter(self.failed_log_path)
+        self.switched_words_log = JsonlWriter(self.switched_words_log_path)
+        self.checkpoint_log = JsonlWriter(self.checkpoint_path)
+        self.progress_log = JsonlWriter(self.progress_log_path)
+
+    @property
+    def checkpoint_state_path(self) -> Path:
+        return self.checkpoint_path.with_suffix(".state")
+
+    def batch_spool_paths(self, batch_index: int) -> tuple[Path, Path]:
+        # LM attempt and failed-word records of one in-flight batch. Each scoring worker
+        # writes only its own spools; they are merged in batch order on commit.
+        return (
+            self.run_log_path.with_suffix(f".batch{batch_index}{self.run_log_path.suffix}"),
+            self.failed_log_path.with_suffix(f".batch{batch_index}{self.failed_log_path.suffix}"),
+        )
+
+    def merge_batch_spools(self, batch_index: int) -> None:
+        run_spool, failed_spool = self.batch_spool_paths(batch_index)
+        self.run_log.append_file(run_spool)
+        self.failed_log.append_file(failed_spool)
+
+    def flush(self) -> None:
+        for writer in (self.switched_words_log, self.checkpoint_log, self.progress_log, self.run_log, self.failed_log):
+            writer.flush()
+
+    def close(self) -> None:
+        for writer in (self.switched_words_log, self.checkpoint_log, self.progress_log, self.run_log, self.failed_log):
+            writer.close()
+
+    def __enter__(self) -> "Step5Logs":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
 
 
 @dataclass(frozen=True)
@@ -88,6 +152,18 @@ class SwitchedWordEvent:
     selected_by_llm: bool
 
 
+@dataclass(frozen=True)
+class PendingBatch:
+    batch_index: int
+    batch: list[RebalanceWord]
+    target_count: int
+    common_count: int
+    batch_mix: str
+    scoring: Future[list[ScoreResult]] | None
+    # Client status messages from the worker, printed when the batch is committed.
+    notices: list[str]
+
+
 @dataclass(frozen=True)
 class Step5ResumeStats:
     resumed_batches: int
@@ -103,20 +179,28 @@ class TransitionSummary:
     switched_count: int
 
 
-def run_step5(options: Step5Options, *, repo: RunCsvRepository, lm_client: LmStudioClient, output_dir: Path) -> None:
+def run_step5(options: Step5Options, *, repo: RunCsvRepository, lm_client: LmStudioClient, output_dir: Path) -> RarityDistribution:
     transitions = options.transitions or []
     validate_transition_set(transitions)
+    if options.max_concurrency < 1:
+        raise ValueError(f"max_concurrency must be >= 1 (got {options.max_concurrency})")
 
     dataset = _load_dataset(options.input_csv_path, repo)
     resolved_endpoint = _resolve_endpoint(options, lm_client)
     logs = _prepare_logs(output_dir, options.run_slug)
     runtime = RebalanceRuntime(
         levels_by_id=dict(dataset.levels_by_id),
-        distribution=RarityDistribution.from_levels(list(dataset.levels_by_id.values())),
+        distribution=RarityDistribution.from_counts({level: len(words) for level, words in dataset.words_by_level.items()}),
         rebalance_rules={},
         processed_word_ids=set(),
     )
     resume_stats = _restore_from_checkpoint(dataset, runtime, logs)
+    # Processed words never become eligible again, so each level's pool is filtered
+    # once here and then shrinks in place as batches draw from it.
+    runtime.unprocessed_by_level = {
+        level: [w for w in words if w.word_id not in runtime.processed_word_ids]
+        for level, words in dataset.words_by_level.items()
+    }
 
     seed = options.seed or int(datetime.now(tz=timezone.utc).timestamp() * 1000)
     rng = random.Random(seed)
@@ -124,7 +208,7 @@ def run_step5(options: Step5Options, *, repo: RunCsvRepository, lm_client: LmStu
     transitions_txt = ",".join([f"{t.describe_sources()}->{t.to_level}" for t in transitions])
     print(
         f"Step 5 rebalance run='{options.run_slug}' seed={seed} batchSize={options.batch_size} "
-        f"lowerRatio={options.lower_ratio:.4f} transitions={transitions_txt}"
+        f"lowerRatio={options.lower_ratio:.4f} maxConcurrency={options.max_concurrency} transitions={transitions_txt}"
     )
     if resume_stats.resumed_batches > 0:
         print(
@@ -136,18 +220,22 @@ def run_step5(options: Step5Options, *, repo: RunCsvRepository, lm_client: LmStu
     print(f"Step 5 progress log: {logs.progress_log_path}")
 
     summaries: list[TransitionSummary] = []
-    for transition in transitions:
-        summary = _apply_transition(
-            transition=transition,
-            options=options,
-            dataset=dataset,
-            runtime=runtime,
-            resolved_endpoint=resolved_endpoint,
-            logs=logs,
-            lm_client=lm_client,
-            rng=rng,
-        )
-        summaries.append(summary)
+    with logs:
+        for transition in transitions:
+            summary = _apply_transition(
+                transition=transition,
+                options=options,
+                dataset=dataset,
+                runtime=runtime,
+                resolved_endpoint=resolved_endpoint,
+                logs=logs,
+                lm_client=lm_client,
+                rng=rng,
+            )
+            summaries.append(summary)
+        if runtime.checkpoint_batches > resume_stats.resumed_batches:
+            logs.flush()
+            _write_checkpoint_state(logs, runtime)
 
     _write_output(dataset, runtime, options, repo)
 
@@ -160,48 +248,82 @@ def run_step5(options: Step5Options, *, repo: RunCsvRepository, lm_client: LmStu
     print(f"Step 5 total switched words: {total_switched}")
     print(f"Step 5 output distribution {runtime.distribution.format()}")
     print(f"Step 5 output CSV: {options.output_csv_path}")
+    # Per-row counts of the written CSV, so callers chaining steps need not re-read it.
+    return RarityDistribution.from_levels(map(runtime.levels_by_id.__getitem__, dataset.row_word_ids))
 
 
 def _load_dataset(path: Path, repo: RunCsvRepository) -> RebalanceDataset:
-    table = repo.read_table(path)
-    required = ["word_id", "word", "type"]
-    missing = [x for x in required if x not in table.headers]
-    if missing:
-        raise ValueError(f"CSV {path} missing required columns: {', '.join(missing)}")
-
-    level_column = _resolve_level_column(table.headers)
-    mutable_rows = [dict(zip(table.headers, rec.values)) for rec in table.records]
+    with repo.stream_table(path) as stream:
+        headers = stream.headers
+        required = ["word_id", "word", "type"]
+        missing = [x for x in required if x not in headers]
+        if missing:
+            raise ValueError(f"CSV {path} missing required columns: {', '.join(missing)}")
+
+        level_column = _resolve_level_column(headers)
+        idx_word_id = headers.index("word_id")
+        idx_word = headers.index("word")
+        idx_type = headers.index("type")
+        idx_level = headers.index(level_column)
+
+        input_rows = [rec.values for rec in stream.records]
+
+    def raise_first_invalid() -> None:
+        # Rare path: re-read the file to report the first bad row with its line number.
+        with repo.stream_table(path) as stream:
+            _raise_first_invalid_row(path, stream.records, idx_word_id, idx_level, level_column)
+
+    row_word_ids, row_levels = parse_id_level_columns(
+        input_rows, idx_word_id, idx_level, source=path, raise_first_invalid=raise_first_invalid
+    )
 
     words_by_id: dict[int, RebalanceWord] = {}
     levels_by_id: dict[int, int] = {}
-
-    for idx, row in enumerate(mutable_rows, start=2):
-        try:
-            word_id = int(row.get("word_id", ""))
-        except Exception as exc:
-            raise CsvFormatError(f"Invalid word_id at {path}:{idx}") from exc
-        try:
-            level = int(row.get(level_column, ""))
-        except Exception as exc:
-            raise CsvFormatError(f"Invalid {level_column} at {path}:{idx}") from exc
-        if level < 1 or level > 5:
-            raise CsvFormatError(f"{level_column} out of range at {path}:{idx}")
-
+    words_by_level: dict[int, list[RebalanceWord]] = {level: [] for level in range(1, 6)}
+    for vals, word_id, level in zip(input_rows, row_word_ids, row_levels):
         words_by_id[word_id] = RebalanceWord(
             word_id=word_id,
-            word=row.get("word", ""),
-            type=row.get("type", ""),
+            word=vals[idx_word],
+            type=vals[idx_type],
         )
         levels_by_id[word_id] = level
 
+    for word_id, word in words_by_id.items():
+        words_by_level[levels_by_id[word_id]].append(word)
+
     return RebalanceDataset(
-        input_headers=list(table.headers),
-        mutable_rows=mutable_rows,
+        input_headers=list(headers),
+        input_rows=input_rows,
+        row_word_ids=row_word_ids,
         words_by_id=words_by_id,
         levels_by_id=levels_by_id,
+        words_by_level=words_by_level,
     )
 
 
+def _raise_first_invalid_row(
+    path: Path,
+    records: Iterable[CsvRecord],
+    idx_word_id: int,
+    idx_level: int,
+    level_column: str,
+) -> NoReturn:
+    for rec in records:
+        vals = rec.values
+        try:
+            int(vals[idx_word_id])
+        except Exception as exc:
+            raise CsvFormatError(f"Invalid word_id at {path}:{rec.line_number}") from exc
+        try:
+            level = int(vals[idx_level])
+        except Exception as exc:
+            raise CsvFormatError(f"Invalid {level_column} at {path}:{rec.line_number}") from exc
+        if level < 1 or level > 5:
+            raise CsvFormatError(f"{level_column} out of range at {path}:{rec.line_number}")
+    # The bulk parse rejected the file, so never fall through to an empty dataset.
+    raise CsvFormatError(f"Invalid rows in {path}")
+
+
 def _resolve_level_column(headers: list[str]) -> str:
     if "final_level" in headers:
         return "final_level"
@@ -234,16 +356,9 @@ def _apply_transition(
     rng: random.Random,
 ) -> TransitionSummary:
     source_levels = transition.source_levels()
-    remaining_by_source: dict[int, list[RebalanceWord]] = {}
-
-    for level in source_levels:
-        items = [
-            w
-            for w in dataset.words_by_id.values()
-            if runtime.levels_by_id.get(w.word_id) == level and w.word_id not in runtime.processed_word_ids
-        ]
-        rng.shuffle(items)
-        remaining_by_source[level] = items
+    # A word's runtime level only diverges from its loaded level once it is processed,
+    # so the unprocessed pool of its loaded level is exactly the eligible set.
+    remaining_by_source = {level: runtime.unprocessed_by_level.setdefault(level, []) for level in source_levels}
 
     initial_source_counts = {lvl: len(remaining_by_source[lvl]) for lvl in source_levels}
     eligible_count = sum(initial_source_counts.values())
@@ -254,92 +369,152 @@ def _apply_transition(
     target_assigned = 0
     switched_count = 0
     expected_target_total = round(eligible_count * options.lower_ratio)
-    batch_index = 0
-
-    while True:
-        batch = _select_stratified_batch(
-            source_levels=source_levels,
-            remaining_by_source_level=remaining_by_source,
-            initial_source_counts=initial_source_counts,
-            max_batch_size=options.batch_size,
-            rng=rng,
-        )
-        if not batch:
-            break
-        batch_index += 1
-
-        target_count = _compute_adaptive_target_count(
-            processed_before_batch=processed,
-            assigned_before_batch=target_assigned,
-            batch_size=len(batch),
-            ratio=options.lower_ratio,
-            expected_total=expected_target_total,
-        )
-        processed += len(batch)
-        batch_mix = _format_batch_source_mix(batch, runtime)
-
-        common_level = min(transition.to_level, transition.other_level())
-        common_count = target_count if transition.to_level == common_level else (len(batch) - target_count)
-
-        if common_count <= 0:
-            selected_common_word_ids: set[int] = set()
-        elif common_count >= len(batch):
-            selected_common_word_ids = {w.word_id for w in batch}
-        else:
-            scored = _score_transition_batch(
-                options=options,
-                transition=transition,
-                common_count=common_count,
-                common_level=common_level,
-                batch=batch,
-                resolved_endpoint=resolved_endpoint,
-                logs=logs,
-                lm_client=lm_client,
-            )
-            selected_common_word_ids = _select_common_word_ids(
-                batch=batch,
-                scored=scored,
-                common_level=common_level,
-                common_count=common_count,
-            )
+    common_level = min(transition.to_level, transition.other_level())
+    base_ctx = _build_scoring_context(
+        options=options,
+        transition=transition,
+        common_level=common_level,
+        resolved_endpoint=resolved_endpoint,
+        logs=logs,
+    )
 
-        switched_events = _apply_batch_assignments(
-            batch=batch,
-            selected_common_word_ids=selected_common_word_ids,
-            transition=transition,
-            runtime=runtime,
-            options=options,
-            logs=logs,
-        )
-        _append_batch_checkpoint(logs, transition, [w.word_id for w in batch], switched_events)
-
-        assigned_to_target = len(selected_common_word_ids) if transition.to_level == common_level else (len(batch) - len(selected_common_word_ids))
-        target_assigned += assigned_to_target
-        switched_count += len(switched_events)
-
-        _append_batch_progress(
-            logs=logs,
-            options=options,
-            transition=transition,
-            batch_index=batch_index,
-            batch=batch,
-            selected_common_word_ids=selected_common_word_ids,
-            common_level=common_level,
-            processed=processed,
-            eligible_count=eligible_count,
-            target_assigned=target_assigned,
-            expected_target_total=expected_target_total,
-            batch_target=target_count,
-            batch_mix=batch_mix,
-            runtime=runtime,
-        )
+    # Batches are planned ahead of their LM results: the strict selection contract
+    # guarantees each batch assigns exactly its planned target count, so planning
+    # only depends on prior plans. Results are committed strictly in plan order.
+    planned_batches = 0
+    planned_processed = 0
+    planned_assigned = 0
+    in_flight: deque[PendingBatch] = deque()
 
-        _print_switched_events(options, transition, switched_events)
-        print(
-            f"Step 5 progress run='{options.run_slug}' transition={transition.describe_sources()}->{transition.to_level} "
-            f"processed={processed}/{eligible_count} target_assigned={target_assigned}/{expected_target_total} "
-            f"batch_target={target_count} batch_mix={batch_mix} {runtime.distribution.format()}"
-        )
+    with ThreadPoolExecutor(max_workers=options.max_concurrency) as pool:
+        try:
+            while True:
+                while len(in_flight) < options.max_concurrency:
+                    batch = _select_stratified_batch(
+                        source_levels=source_levels,
+                        remaining_by_source_level=remaining_by_source,
+                        initial_source_counts=initial_source_counts,
+                        max_batch_size=options.batch_size,
+                        rng=rng,
+                    )
+                    if not batch:
+                        break
+                    planned_batches += 1
+                    target_count = _compute_adaptive_target_count(
+                        processed_before_batch=planned_processed,
+                        assigned_before_batch=planned_assigned,
+                        batch_size=len(batch),
+                        ratio=options.lower_ratio,
+                        expected_total=expected_target_total,
+                    )
+                    planned_processed += len(batch)
+                    planned_assigned += target_count
+                    common_count = target_count if transition.to_level == common_level else (len(batch) - target_count)
+
+                    future = None
+                    notices: list[str] = []
+                    if 0 < common_count < len(batch):
+                        run_spool, failed_spool = logs.batch_spool_paths(planned_batches)
+                        # Drop spools an interrupted run left behind under the same index.
+                        run_spool.unlink(missing_ok=True)
+                        failed_spool.unlink(missing_ok=True)
+                        future = pool.submit(
+                            _score_transition_batch,
+                            base_ctx=replace(
+                                base_ctx, run_log_path=run_spool, failed_log_path=failed_spool, notices=notices
+                            ),
+                            common_count=common_count,
+                            batch=batch,
+                            lm_client=lm_client,
+                        )
+                    in_flight.append(
+                        PendingBatch(
+                            batch_index=planned_batches,
+                            batch=batch,
+                            target_count=target_count,
+                            common_count=common_count,
+                            batch_mix=_format_batch_source_mix(batch, runtime),
+                            scoring=future,
+                            notices=notices,
+                        )
+                    )
+
+                if not in_flight:
+                    break
+                pending = in_flight.popleft()
+                batch = pending.batch
+                processed += len(batch)
+                batch_ts = datetime.now(tz=timezone.utc).isoformat()
+
+                if pending.scoring is not None:
+                    try:
+                        scored = pending.scoring.result()
+                    finally:
+                        _commit_batch_side_output(logs, pending)
+                    selected_common_word_ids = _select_common_word_ids(
+                        batch=batch,
+                        scored=scored,
+                        common_level=common_level,
+                        common_count=pending.common_count,
+                    )
+                elif pending.common_count <= 0:
+                    selected_common_word_ids = set()
+                else:
+                    selected_common_word_ids = {w.word_id for w in batch}
+
+                switched_events = _apply_batch_assignments(
+                    batch=batch,
+                    selected_common_word_ids=selected_common_word_ids,
+                    transition=transition,
+                    runtime=runtime,
+                    options=options,
+                    logs=logs,
+                    timestamp=batch_ts,
+                )
+                _append_batch_checkpoint(logs, transition, [w.word_id for w in batch], switched_events, timestamp=batch_ts)
+                runtime.checkpoint_batches += 1
+
+                assigned_to_target = len(selected_common_word_ids) if transition.to_level == common_level else (len(batch) - len(selected_common_word_ids))
+                target_assigned += assigned_to_target
+                switched_count += len(switched_events)
+
+                _append_batch_progress(
+                    logs=logs,
+                    options=options,
+                    transition=transition,
+                    batch_index=pending.batch_index,
+                    batch=batch,
+                    selected_common_word_ids=selected_common_word_ids,
+                    common_level=common_level,
+                    processed=processed,
+                    eligible_count=eligible_count,
+                    target_assigned=target_assigned,
+                    expected_target_total=expected_target_total,
+                    batch_target=pending.target_count,
+                    batch_mix=pending.batch_mix,
+                    runtime=runtime,
+                    timestamp=batch_ts,
+                )
+                logs.flush()
+                if runtime.checkpoint_batches % _CHECKPOINT_STATE_EVERY == 0:
+                    _write_checkpoint_state(logs, runtime)
+
+                lines = _format_switched_events(options, transition, switched_events)
+                lines.append(
+                    f"Step 5 progress run='{options.run_slug}' transition={transition.describe_sources()}->{transition.to_level} "
+                    f"processed={processed}/{eligible_count} target_assigned={target_assigned}/{expected_target_total} "
+                    f"batch_target={pending.target_count} batch_mix={pending.batch_mix} {runtime.distribution.format()}"
+                )
+                sys.stdout.write("\n".join(lines) + "\n")
+        except BaseException:
+            for pending in in_flight:
+                if pending.scoring is not None:
+                    pending.scoring.cancel()
+            # Keep the attempt logs of batches that were already sent.
+            pool.shutdown(wait=True)
+            for pending in in_flight:
+                _commit_batch_side_output(logs, pending)
+            raise
 
     return TransitionSummary(
         transition=transition,
@@ -349,6 +524,13 @@ def _apply_transition(
     )
 
 
+def _commit_batch_side_output(logs: Step5Logs, pending: PendingBatch) -> None:
+    # Worker output of a finished batch, emitted in batch order by the main thread.
+    logs.merge_batch_spools(pending.batch_index)
+    if pending.notices:
+        sys.stdout.write("\n".join(pending.notices) + "\n")
+
+
 def _select_stratified_batch(
     *,
     source_levels: list[int],
@@ -357,7 +539,8 @@ def _select_stratified_batch(
     max_batch_size: int,
     rng: random.Random,
 ) -> list[RebalanceWord]:
-    total_remaining = sum(len(remaining_by_source_level.get(level, [])) for level in source_levels)
+    available = {level: len(remaining_by_source_level.get(level, [])) for level in source_levels}
+    total_remaining = sum(available.values())
     if total_remaining == 0:
         return []
 
@@ -365,58 +548,59 @@ def _select_stratified_batch(
     if len(source_levels) == 1:
         quotas = {source_levels[0]: batch_size}
     else:
-        total_initial = float(sum(initial_source_counts.values()))
+        # Largest-remainder apportionment in integer arithmetic.
+        total_initial = sum(initial_source_counts.values())
         quotas = {}
+        remainders = {}
         for level in source_levels:
-            quotas[level] = int(batch_size * ((initial_source_counts.get(level, 0) / total_initial)))
-
+            quotas[level], remainders[level] = divmod(batch_size * initial_source_counts.get(level, 0), total_initial)
         unassigned = batch_size - sum(quotas.values())
-        fractions = sorted(
-            source_levels,
-            key=lambda level: (batch_size * ((initial_source_counts.get(level, 0) / total_initial))) - quotas[level],
-            reverse=True,
-        )
-        for level in fractions:
-            if unassigned <= 0:
-                break
+        for level in sorted(source_levels, key=remainders.__getitem__, reverse=True)[:unassigned]:
             quotas[level] += 1
-            unassigned -= 1
 
     missing = 0
     for level in source_levels:
-        available = len(remaining_by_source_level.get(level, []))
-        planned = quotas.get(level, 0)
-        if planned > available:
-            missing += planned - available
-            quotas[level] = available
-
-    while missing > 0:
-        candidates = [
-            level
-            for level in source_levels
-            if quotas.get(level, 0) < len(remaining_by_source_level.get(level, []))
-        ]
-        if not candidates:
-            break
-        candidate = max(
-            candidates,
-            key=lambda level: len(remaining_by_source_level.get(level, [])) - quotas.get(level, 0),
-        )
-        quotas[candidate] += 1
-        missing -= 1
+        if quotas[level] > available[level]:
+            missing += quotas[level] - available[level]
+            quotas[level] = available[level]
+
+    if missing > 0:
+        # Same result as handing the shortfall out one word at a time to the level with
+        # the most spare capacity (earliest level on ties): the k levels with the most
+        # spare are levelled down together, and the earliest take any odd words.
+        spare = {level: available[level] - quotas[level] for level in source_levels}
+        by_spare = sorted(source_levels, key=spare.__getitem__, reverse=True)
+        top_spare = 0
+        for k, level in enumerate(by_spare, start=1):
+            top_spare += spare[level]
+            next_spare = spare[by_spare[k]] if k < len(by_spare) else 0
+            if top_spare - k * next_spare >= missing:
+                break
+        top = set(by_spare[:k])
+        left, odd = divmod(top_spare - missing, k)
+        for i, level in enumerate(lvl for lvl in source_levels if lvl in top):
+            quotas[level] = available[level] - left - (1 if i >= k - odd else 0)
 
     batch: list[RebalanceWord] = []
     for level in source_levels:
-        queue = remaining_by_source_level.get(level, [])
-        take = quotas.get(level, 0)
-        for _ in range(take):
-            if queue:
-                batch.append(queue.pop())
+        batch.extend(_draw_random(remaining_by_source_level.get(level, []), quotas[level], rng))
 
     rng.shuffle(batch)
     return batch
 
 
+def _draw_random(pool: list[RebalanceWord], count: int, rng: random.Random) -> list[RebalanceWord]:
+    if count <= 0:
+        return []
+    positions = rng.sample(range(len(pool)), count)
+    drawn = [pool[pos] for pos in positions]
+    # Swap-remove from the highest position down so pending positions stay valid.
+    for pos in sorted(positions, reverse=True):
+        pool[pos] = pool[-1]
+        pool.pop()
+    return drawn
+
+
 def _compute_adaptive_target_count(
     *,
     processed_before_batch: int,
@@ -443,18 +627,15 @@ def _format_batch_source_mix(batch: list[RebalanceWord], runtime: RebalanceRunti
     return f"[{' '.join(parts)}]"
 
 
-def _score_transition_batch(
+def _build_scoring_context(
     *,
     options: Step5Options,
     transition: LevelTransition,
-    common_count: int,
     common_level: int,
-    batch: list[RebalanceWord],
     resolved_endpoint: ResolvedEndpoint,
     logs: Step5Logs,
-    lm_client: LmStudioClient,
-) -> list[ScoreResult]:
-    scoring_ctx = ScoringContext(
+) -> ScoringContext:
+    return ScoringContext(
         run_slug=f"{options.run_slug}_{transition.describe_sources().replace('-', '_')}_{transition.to_level}",
         model=options.model,
         endpoint=resolved_endpoint.endpoint,
@@ -467,12 +648,20 @@ def _score_transition_batch(
         flavor=resolved_endpoint.flavor,
         max_tokens=options.max_tokens,
         allow_partial_results=False,
-        expected_json_items=common_count,
         output_mode=ScoringOutputMode.SELECTED_WORD_IDS,
         forced_rarity_level=common_level,
     )
+
+
+def _score_transition_batch(
+    *,
+    base_ctx: ScoringContext,
+    common_count: int,
+    batch: list[RebalanceWord],
+    lm_client: LmStudioClient,
+) -> list[ScoreResult]:
     base_rows = [BaseWordRow(word_id=w.word_id, word=w.word, type=w.type) for w in batch]
-    return lm_client.score_batch_resilient(base_rows, scoring_ctx)
+    return lm_client.score_batch_resilient(base_rows, replace(base_ctx, expected_json_items=common_count))
 
 
 def _select_common_word_ids(
@@ -482,18 +671,21 @@ def _select_common_word_ids(
     common_level: int,
     common_count: int,
 ) -> set[int]:
-    batch_ids = {w.word_id for w in batch}
-    selected = []
-    seen = set()
+    index_by_id = {w.word_id: i for i, w in enumerate(batch)}
+    selected_mask = bytearray(len(batch))
+    selected_count = 0
     for s in scored:
-        if s.word_id in batch_ids and s.rarity_level == common_level and s.word_id not in seen:
-            seen.add(s.word_id)
-            selected.append(s.word_id)
-    if len(selected) != common_count:
+        if s.rarity_level != common_level:
+            continue
+        idx = index_by_id.get(s.word_id)
+        if idx is not None and not selected_mask[idx]:
+            selected_mask[idx] = 1
+            selected_count += 1
+    if selected_count != common_count:
         raise RuntimeError(
-            f"Expected exactly {common_count} selected word_ids, got {len(selected)}. Prompt/parse contract violation."
+            f"Expected exactly {common_count} selected word_ids, got {selected_count}. Prompt/parse contract violation."
         )
-    return set(selected)
+    return {batch[i].word_id for i, flag in enumerate(selected_mask) if flag}
 
 
 def _apply_batch_assignments(
@@ -504,6 +696,7 @@ def _apply_batch_assignments(
     runtime: RebalanceRuntime,
     options: Step5Options,
     logs: Step5Logs,
+    timestamp: str,
 ) -> list[SwitchedWordEvent]:
     common_level = min(transition.to_level, transition.other_level())
     rare_level = max(transition.to_level, transition.other_level())
@@ -529,13 +722,20 @@ def _apply_batch_assignments(
                 selected_by_llm=word.word_id in selected_common_word_ids,
             )
             switched_events.append(ev)
-            _log_switched_word(logs, options, transition, ev)
+            _log_switched_word(logs, options, transition, ev, timestamp=timestamp)
     return switched_events
 
 
-def _log_switched_word(logs: Step5Logs, options: Step5Options, transition: LevelTransition, switched: SwitchedWordEvent) -> None:
+def _log_switched_word(
+    logs: Step5Logs,
+    options: Step5Options,
+    transition: LevelTransition,
+    switched: SwitchedWordEvent,
+    *,
+    timestamp: str,
+) -> None:
     payload = {
-        "timestamp": datetime.now(tz=timezone.utc).isoformat(),
+        "timestamp": timestamp,
         "run_slug": options.run_slug,
         "model": options.model,
         "word_id": switched.word_id,
@@ -546,12 +746,19 @@ def _log_switched_word(logs: Step5Logs, options: Step5Options, transition: Level
         "selected_by_llm": switched.selected_by_llm,
         "transition": f"{transition.describe_sources()}->{transition.to_level}",
     }
-    _append_json_line(logs.switched_words_log_path, payload)
+    logs.switched_words_log.write(payload)
 
 
-def _append_batch_checkpoint(logs: Step5Logs, transition: LevelTransition, processed_word_ids: list[int], switched_events: list[SwitchedWordEvent]) -> None:
+def _append_batch_checkpoint(
+    logs: Step5Logs,
+    transition: LevelTransition,
+    processed_word_ids: list[int],
+    switched_events: list[SwitchedWordEvent],
+    *,
+    timestamp: str,
+) -> None:
     payload = {
-        "timestamp": datetime.now(tz=timezone.utc).isoformat(),
+        "timestamp": timestamp,
         "transition": f"{transition.describe_sources()}->{transition.to_level}",
         "processed_word_ids": processed_word_ids,
         "switched": [
@@ -559,7 +766,7 @@ def _append_batch_checkpoint(logs: Step5Logs, transition: LevelTransition, proce
             for ev in switched_events
         ],
     }
-    _append_json_line(logs.checkpoint_path, payload)
+    logs.checkpoint_log.write(payload)
 
 
 def _append_batch_progress(
@@ -578,6 +785,7 @@ def _append_batch_progress(
     batch_target: int,
     batch_mix: str,
     runtime: RebalanceRuntime,
+    timestamp: str,
 ) -> None:
     batch_by_id = {w.word_id: w for w in batch}
     selected_common_sorted = sorted(selected_common_word_ids)
@@ -588,7 +796,7 @@ def _append_batch_progress(
         target_word_ids = sorted([w.word_id for w in batch if w.word_id not in selected_common_word_ids])
 
     payload = {
-        "timestamp": datetime.now(tz=timezone.utc).isoformat(),
+        "timestamp": timestamp,
         "run_slug": options.run_slug,
         "transition": f"{transition.describe_sources()}->{transition.to_level}",
         "batch_index": batch_index,
@@ -616,10 +824,67 @@ def _append_batch_progress(
             "5": runtime.distribution.count(5),
         },
     }
-    _append_json_line(logs.progress_log_path, payload)
+    logs.progress_log.write(payload)
     run_payload = dict(payload)
     run_payload["event"] = "batch_progress"
-    _append_json_line(logs.run_log_path, run_payload)
+    logs.run_log.write(run_payload)
+
+
+def _write_checkpoint_state(logs: Step5Logs, runtime: RebalanceRuntime) -> None:
+    rules: list[str] = []
+    rule_index: dict[str, int] = {}
+    switched: dict[int, tuple[int, int]] = {}
+    for word_id, rule in runtime.rebalance_rules.items():
+        idx = rule_index.get(rule)
+        if idx is None:
+            idx = rule_index[rule] = len(rules)
+            rules.append(rule)
+        switched[word_id] = (runtime.levels_by_id[word_id], idx)
+
+    checkpoint_bytes = logs.checkpoint_path.stat().st_size
+    with logs.checkpoint_path.open("rb") as handle:
+        handle.seek(max(0, checkpoint_bytes - _CHECKPOINT_STATE_TAIL_BYTES))
+        tail = handle.read(_CHECKPOINT_STATE_TAIL_BYTES)
+
+    state = {
+        "version": _CHECKPOINT_STATE_VERSION,
+        "batches_covered": runtime.checkpoint_batches,
+        "checkpoint_bytes": checkpoint_bytes,
+        "checkpoint_tail": tail,
+        "processed_word_ids": runtime.processed_word_ids,
+        "switched": switched,
+        "rules": rules,
+    }
+    path = logs.checkpoint_state_path
+    tmp = path.with_suffix(".state.tmp")
+    with tmp.open("wb") as handle:
+        pickle.dump(state, handle, protocol=pickle.HIGHEST_PROTOCOL)
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(tmp, path)
+
+
+def _load_checkpoint_state(logs: Step5Logs) -> dict | None:
+    # The state file is only a shortcut over the JSONL; anything that does not
+    # match the current checkpoint prefix is ignored and the JSONL is replayed.
+    path = logs.checkpoint_state_path
+    if not path.exists():
+        return None
+    try:
+        with path.open("rb") as handle:
+            state = pickle.load(handle)
+        if type(state) is not dict or state.get("version") != _CHECKPOINT_STATE_VERSION:
+            return None
+        checkpoint_bytes = state["checkpoint_bytes"]
+        tail = state["checkpoint_tail"]
+        with logs.checkpoint_path.open("rb") as handle:
+            handle.seek(max(0, checkpoint_bytes - len(tail)))
+            if handle.read(len(tail)) != tail:
+                return None
+    except (OSError, pickle.UnpicklingError, EOFError, KeyError, TypeError):
+        # Unreadable, truncated, or from an older layout; anything else is a bug.
+        return None
+    return state
 
 
 def _restore_from_checkpoint(dataset: RebalanceDataset, runtime: RebalanceRuntime, logs: Step5Logs) -> Step5ResumeStats:
@@ -630,107 +895,119 @@ def _restore_from_checkpoint(dataset: RebalanceDataset, runtime: RebalanceRuntim
     resumed_processed = 0
     resumed_switched = 0
     applied_switched_ids: set[int] = set()
-
-    with logs.checkpoint_path.open("r", encoding="utf-8") as handle:
-        for raw in handle:
-            line = raw.strip()
-            if not line:
+    words_by_id = dataset.words_by_id
+    processed_ids = runtime.processed_word_ids
+    offset = 0
+
+    state = _load_checkpoint_state(logs)
+    if state is not None:
+        offset = state["checkpoint_bytes"]
+        resumed_batches = state["batches_covered"]
+        for word_id in state["processed_word_ids"]:
+            if word_id in words_by_id and word_id not in processed_ids:
+                processed_ids.add(word_id)
+                resumed_processed += 1
+        rules = state["rules"]
+        for word_id, (new_level, rule_idx) in state["switched"].items():
+            if word_id not in words_by_id:
                 continue
-            node = json.loads(line)
-            resumed_batches += 1
-
-            processed = node.get("processed_word_ids")
-            if isinstance(processed, list):
-                for pid in processed:
-                    try:
-                        word_id = int(pid)
-                    except Exception:
-                        continue
-                    if word_id > 0 and word_id in dataset.words_by_id and word_id not in runtime.processed_word_ids:
-                        runtime.processed_word_ids.add(word_id)
-                        resumed_processed += 1
-
-            switched = node.get("switched")
-            if isinstance(switched, list):
-                for item in switched:
-                    if not isinstance(item, dict):
-                        continue
-                    try:
-                        word_id = int(item.get("word_id", -1))
-                        new_level = int(item.get("new_level", -1))
-                    except Exception:
-                        continue
-                    rule = str(item.get("rule", ""))
-                    if word_id <= 0 or new_level not in {1, 2, 3, 4, 5}:
-                        continue
-                    if word_id not in dataset.words_by_id or word_id in applied_switched_ids:
-                        continue
-                    applied_switched_ids.add(word_id)
-                    previous = runtime.levels_by_id.get(word_id)
-                    runtime.levels_by_id[word_id] = new_level
-                    runtime.distribution.set_level(previous, new_level)
-                    if rule:
-                        runtime.rebalance_rules[word_id] = rule
-                    resumed_switched += 1
-
+            applied_switched_ids.add(word_id)
+            previous = runtime.levels_by_id.get(word_id)
+            runtime.levels_by_id[word_id] = new_level
+            runtime.distribution.set_level(previous, new_level)
+            runtime.rebalance_rules[word_id] = rules[rule_idx]
+            resumed_switched += 1
+
+    # Checkpoints are written by _append_batch_checkpoint with int ids/levels, so
+    # entries of any other shape are skipped instead of coerced.
+    for line in iter_jsonl_lines(logs.checkpoint_path, offset):
+        node = json.loads(line)
+        resumed_batches += 1
+
+        processed = node.get("processed_word_ids")
+        if type(processed) is list:
+            for word_id in processed:
+                if type(word_id) is int and word_id in words_by_id and word_id not in processed_ids:
+                    processed_ids.add(word_id)
+                    resumed_processed += 1
+
+        switched = node.get("switched")
+        if type(switched) is list:
+            for item in switched:
+                if type(item) is not dict:
+                    continue
+                word_id = item.get("word_id")
+                new_level = item.get("new_level")
+                if type(word_id) is not int or type(new_level) is not int or new_level not in VALID_LEVELS:
+                    continue
+                if word_id not in words_by_id or word_id in applied_switched_ids:
+                    continue
+                applied_switched_ids.add(word_id)
+                previous = runtime.levels_by_id.get(word_id)
+                runtime.levels_by_id[word_id] = new_level
+                runtime.distribution.set_level(previous, new_level)
+                rule = item.get("rule")
+                if rule:
+                    runtime.rebalance_rules[word_id] = str(rule)
+                resumed_switched += 1
+
+    runtime.checkpoint_batches = resumed_batches
     return Step5ResumeStats(resumed_batches, resumed_processed, resumed_switched)
 
 
-def _print_switched_events(options: Step5Options, transition: LevelTransition, switched_events: list[SwitchedWordEvent]) -> None:
+def _format_switched_events(options: Step5Options, transition: LevelTransition, switched_events: list[SwitchedWordEvent]) -> list[str]:
     if not switched_events:
-        return
+        return []
     selected = [ev for ev in switched_events if ev.selected_by_llm]
     not_selected = [ev for ev in switched_events if not ev.selected_by_llm]
-    print(
+    lines = [
         f"Step 5 switched run='{options.run_slug}' transition={transition.describe_sources()}->{transition.to_level} changed={len(switched_events)}"
-    )
-    _print_switched_group("selected", selected)
-    _print_switched_group("not", not_selected)
+    ]
+    lines.extend(_format_switched_group("selected", selected))
+    lines.extend(_format_switched_group("not", not_selected))
+    return lines
 
 
-def _print_switched_group(label: str, events: list[SwitchedWordEvent]) -> None:
-    if not events:
-        return
-    chunks = [events[i : i + 7] for i in range(0, len(events), 7)]
-    for idx, chunk in enumerate(chunks):
+def _format_switched_group(label: str, events: list[SwitchedWordEvent]) -> list[str]:
+    lines = []
+    for idx in range(0, len(events), 7):
         prefix = f"  {label}: " if idx == 0 else "    "
         content = " | ".join(
             [
                 f"{ev.word}({'+' if ev.next_level > ev.previous_level else '-' if ev.next_level < ev.previous_level else '='})"
-                for ev in chunk
+                for ev in events[idx : idx + 7]
             ]
         )
-        print(prefix + content)
+        lines.append(prefix + content)
+    return lines
 
 
 def _write_output(dataset: RebalanceDataset, runtime: RebalanceRuntime, options: Step5Options, repo: RunCsvRepository) -> None:
     headers = list(dataset.input_headers)
-    for col in ["final_level", "rebalance_rule", "rebalance_model", "rebalance_run", "rebalanced_at"]:
+    for col in REBALANCE_OUTPUT_COLUMNS:
         if col not in headers:
             headers.append(col)
+    padding = [""] * (len(headers) - len(dataset.input_headers))
+    idx_final, idx_rule, idx_model, idx_run, idx_at = (headers.index(col) for col in REBALANCE_OUTPUT_COLUMNS)
 
     rebalanced_at = datetime.now(tz=timezone.utc).isoformat()
-    rows: list[list[str]] = []
-    for row in dataset.mutable_rows:
-        try:
-            word_id = int(row.get("word_id", ""))
-        except Exception as exc:
-            raise CsvFormatError("Invalid word_id in memory while writing output") from exc
-
-        final_level = runtime.levels_by_id.get(word_id)
-        if final_level is None:
-            raise CsvFormatError(f"Missing level for word_id={word_id}")
-
-        row["final_level"] = str(final_level)
-        changed = word_id in runtime.rebalance_rules
-        row["rebalance_rule"] = runtime.rebalance_rules.get(word_id, "")
-        row["rebalance_model"] = options.model if changed else row.get("rebalance_model", "")
-        row["rebalance_run"] = options.run_slug if changed else row.get("rebalance_run", "")
-        row["rebalanced_at"] = rebalanced_at if changed else row.get("rebalanced_at", "")
-
-        rows.append([row.get(h, "") for h in headers])
-
-    repo.write_table_atomic(options.output_csv_path, headers, rows)
+    with repo.open_table_writer(options.output_csv_path, headers) as sink:
+        for values, word_id in zip(dataset.input_rows, dataset.row_word_ids):
+            final_level = runtime.levels_by_id.get(word_id)
+            if final_level is None:
+                raise CsvFormatError(f"Missing level for word_id={word_id}")
+
+            row = values + padding
+            row[idx_final] = str(final_level)
+            rule = runtime.rebalance_rules.get(word_id)
+            if rule is None:
+                row[idx_rule] = ""
+            else:
+                row[idx_rule] = rule
+                row[idx_model] = options.model
+                row[idx_run] = options.run_slug
+                row[idx_at] = rebalanced_at
+            sink.write(row)
 
 
 def _render_template(template: str, transition: LevelTransition, common_level: int) -> str:
@@ -764,9 +1041,3 @@ def _prepare_logs(output_dir: Path, run_slug: str) -> Step5Logs:
         progress_log_path=progress_dir / f"{run_slug}.progress.jsonl",
     )
 
-
-def _append_json_line(path: Path, payload: dict[str, object]) -> None:
-    path.parent.mkdir(parents=True, exist_ok=True)
-    with path.open("a", encoding="utf-8") as handle:
-        handle.write(json.dumps(payload, ensure_ascii=False))
-        handle.write("\n")
@@ -1,7 +1,12 @@
 from __future__ import annotations
 
+from array import array
+from collections.abc import Callable, Sequence
 from pathlib import Path
 
+_DIGIT_VALUES = bytes.maketrans(b"0123456789", bytes(range(10)))
+VALID_LEVELS = frozenset({1, 2, 3, 4, 5})
+
 
 def sanitize_run_slug(raw: str) -> str:
     normalized = raw.strip().lower().replace("-", "_")
@@ -16,6 +21,15 @@ def sanitize_run_slug(raw: str) -> str:
 def median(values: list[int]) -> int:
     if not values:
         raise ValueError("median() requires non-empty values")
+    n = len(values)
+    # Step3 takes the median of 1-3 run levels per word; skip the sort for those.
+    if n == 1:
+        return values[0]
+    if n == 2:
+        return round((values[0] + values[1]) / 2.0)
+    if n == 3:
+        a, b, c = values
+        return max(min(a, b), min(max(a, b), c))
     sorted_vals = sorted(values)
     mid = len(sorted_vals) // 2
     if len(sorted_vals) % 2 == 1:
@@ -23,6 +37,42 @@ def median(values: list[int]) -> int:
     return round((sorted_vals[mid - 1] + sorted_vals[mid]) / 2.0)
 
 
+def parse_digit_column(values: list[str]) -> array | None:
+    # Level columns are single ASCII digits; decode them in one join/translate
+    # instead of an int() call per cell. None means some cell needs int().
+    if not all(map((1).__eq__, map(len, values))):
+        return None
+    joined = "".join(values)
+    if not (joined.isascii() and joined.isdigit()):
+        return None
+    return array("b", joined.encode("ascii").translate(_DIGIT_VALUES))
+
+
+def parse_id_level_columns(
+    rows: Sequence[Sequence[str]],
+    idx_word_id: int,
+    idx_level: int,
+    *,
+    source: Path,
+    raise_first_invalid: Callable[[], object],
+) -> tuple[list[int], Sequence[int]]:
+    # Column-wise pass over the word_id and 1..5 level cells. On any bad cell the
+    # caller's row-by-row walk runs to report it with its line number; if that
+    # walk returns anyway, the columns are still rejected.
+    try:
+        word_ids = list(map(int, [vals[idx_word_id] for vals in rows]))
+        level_values = [vals[idx_level] for vals in rows]
+        levels = parse_digit_column(level_values)
+        if levels is None:
+            levels = list(map(int, level_values))
+    except ValueError:
+        levels = None
+    if levels is None or not VALID_LEVELS.issuperset(levels):
+        raise_first_invalid()
+        raise ValueError(f"Invalid word_id/level values in {source}")
+    return word_ids, levels
+
+
 def load_prompt(path: Path) -> str:
     if not path.exists():
         raise FileNotFoundError(f"Prompt file does not exist: {path}")
@@ -1,10 +1,16 @@
 from __future__ import annotations
 
 import json
+import re
+from itertools import chain
 from pathlib import Path
 
+from ..jsonl_reader import iter_jsonl_lines
 from ..run_csv_repository import RunCsvRepository
 
+# Prefix of the lines LmStudioClient._log_failed_word writes; anything else goes through json.loads.
+_FAILED_LINE_WORD_ID = re.compile(rb'\{"ts": "[^"\\]*", "run": "[^"\\]*", "word_id": (-?\d+),')
+
 
 def build_retry_input(*, failed_jsonl: Path, base_csv: Path, output_csv: Path, repo: RunCsvRepository) -> int:
     if not failed_jsonl.exists():
@@ -13,39 +19,40 @@ def build_retry_input(*, failed_jsonl: Path, base_csv: Path, output_csv: Path, r
         raise FileNotFoundError(f"Base CSV not found: {base_csv}")
 
     wanted_ids: set[int] = set()
-    with failed_jsonl.open("r", encoding="utf-8") as handle:
-        for raw in handle:
-            line = raw.strip()
-            if not line:
-                continue
-            try:
-                node = json.loads(line)
-            except Exception:
-                continue
-            word_id = node.get("word_id")
-            try:
-                wanted_ids.add(int(word_id))
-            except Exception:
-                continue
-
-    table = repo.read_table(base_csv)
-    if not table.records:
-        repo.write_rows(output_csv, table.headers, [])
-        return 0
-
-    if "word_id" not in table.headers:
-        raise ValueError(f"Base CSV must contain word_id: {base_csv}")
-
-    idx = table.headers.index("word_id")
-    rows = []
-    for rec in table.records:
+    for line in iter_jsonl_lines(failed_jsonl):
+        match = _FAILED_LINE_WORD_ID.match(line)
+        if match is not None:
+            wanted_ids.add(int(match.group(1)))
+            continue
+        try:
+            node = json.loads(line)
+        except Exception:
+            continue
+        word_id = node.get("word_id")
         try:
-            word_id = int(rec.values[idx])
+            wanted_ids.add(int(word_id))
         except Exception:
             continue
-        if word_id in wanted_ids:
-            rows.append(rec.values)
 
-    output_csv.parent.mkdir(parents=True, exist_ok=True)
-    repo.write_rows(output_csv, table.headers, rows)
-    return len(rows)
+    wanted = frozenset(wanted_ids)
+    with repo.stream_table(base_csv) as stream:
+        first = next(stream.records, None)
+        if first is None:
+            repo.write_rows(output_csv, stream.headers, [])
+            return 0
+
+        if "word_id" not in stream.headers:
+            raise ValueError(f"Base CSV must contain word_id: {base_csv}")
+
+        idx = stream.headers.index("word_id")
+        written = 0
+        with repo.open_table_writer(output_csv, stream.headers) as sink:
+            for rec in chain((first,), stream.records):
+                try:
+                    word_id = int(rec.values[idx])
+                except Exception:
+                    continue
+                if word_id in wanted:
+                    sink.write(rec.values)
+                    written += 1
+    return written
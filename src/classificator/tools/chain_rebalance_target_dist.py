@@ -1,12 +1,19 @@
 from __future__ import annotations
 
+import os
+import shutil
+import sys
+from array import array
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
 from ..constants import DEFAULT_REBALANCE_BATCH_SIZE
 from ..lm.client import LmStudioClient
+from ..distribution import RarityDistribution
 from ..run_csv_repository import RunCsvRepository
 from ..steps.step5_rebalance import Step5Options, run_step5
+from ..support import parse_digit_column
 from ..tools.quality_audit import run_quality_audit
 from ..transitions import LevelTransition
 
@@ -78,19 +85,21 @@ def run_chain_rebalance(*, options: ChainOptions, repo: RunCsvRepository, lm_cli
         raise ValueError(f"Invalid target distribution for total={total_words}: computed level4={target_l4}")
     targets = {1: target_l1, 2: target_l2, 3: target_l3, 4: target_l4, 5: target_l5}
 
-    print("Starting chained rarity rebalancing campaign")
-    print(f"model={options.model}")
-    print(f"run_base={options.run_base}")
-    print(f"resume={options.resume} state_file={options.state_file} last_completed_step={last_completed}")
-    print(
-        f"batch_size={options.batch_size} max_tokens={options.max_tokens} timeout_seconds={options.timeout_seconds} max_retries={options.max_retries}"
-    )
-    print(f"current_csv={current_csv}")
-    print(f"target_distribution=[1:{target_l1} 2:{target_l2} 3:{target_l3} 4:{target_l4} 5:{target_l5}] total={total_words}")
+    header = [
+        "Starting chained rarity rebalancing campaign",
+        f"model={options.model}",
+        f"run_base={options.run_base}",
+        f"resume={options.resume} state_file={options.state_file} last_completed_step={last_completed}",
+        f"batch_size={options.batch_size} max_tokens={options.max_tokens} timeout_seconds={options.timeout_seconds} max_retries={options.max_retries}",
+        f"current_csv={current_csv}",
+        f"target_distribution=[1:{target_l1} 2:{target_l2} 3:{target_l3} 4:{target_l4} 5:{target_l5}] total={total_words}",
+    ]
+    _write_lines(header)
 
-    system_prompt = options.system_prompt_file.read_text(encoding="utf-8")
-    user_prompt = options.user_template_file.read_text(encoding="utf-8")
+    system_prompt = _read_prompt(options.system_prompt_file)
+    user_prompt = _read_prompt(options.user_template_file)
 
+    step_counts: RarityDistribution | None = None
     for step_idx, transition in transitions:
         next_csv = options.runs_dir / f"{options.run_base}_step{step_idx}.csv"
         if options.resume and step_idx <= last_completed:
@@ -103,8 +112,12 @@ def run_chain_rebalance(*, options: ChainOptions, repo: RunCsvRepository, lm_cli
         from_low = transition.from_level
         from_high = transition.from_level_upper or transition.from_level
         to_level = transition.to_level
-        count_low = _get_level_count(current_csv, from_low, repo)
-        count_high = _get_level_count(current_csv, from_high, repo)
+        # Only the first executed step reads its input; later steps take the counts
+        # run_step5 reported for the file it wrote, so there is nothing to preload.
+        if step_counts is None:
+            step_counts = _get_level_counts(current_csv, repo)
+        count_low = step_counts.count(from_low)
+        count_high = step_counts.count(from_high)
         pool = count_low + count_high
         target_to_level = targets[to_level]
 
@@ -121,15 +134,20 @@ def run_chain_rebalance(*, options: ChainOptions, repo: RunCsvRepository, lm_cli
 
         step_slug = _sanitize_slug(f"s{step_idx}_{from_low}{from_high}to{to_level}_{options.run_base[-24:]}")
 
-        print(f"\n========== STEP {step_idx} ==========")
-        print(f"input_csv={current_csv}")
-        print(f"output_csv={next_csv}")
-        print(f"run_slug={step_slug}")
-        print(f"transition={from_low}-{from_high}->{to_level}")
-        print(f"pool={pool} (l{from_low}={count_low}, l{from_high}={count_high})")
-        print(f"target_l{to_level}={target_to_level} ratio={ratio:.12f}")
+        # One write per step block; run_step5 prints its own output after it.
+        _write_lines(
+            [
+                f"\n========== STEP {step_idx} ==========",
+                f"input_csv={current_csv}",
+                f"output_csv={next_csv}",
+                f"run_slug={step_slug}",
+                f"transition={from_low}-{from_high}->{to_level}",
+                f"pool={pool} (l{from_low}={count_low}, l{from_high}={count_high})",
+                f"target_l{to_level}={target_to_level} ratio={ratio:.12f}",
+            ]
+        )
 
-        run_step5(
+        step_counts = run_step5(
             Step5Options(
                 run_slug=step_slug,
                 model=options.model,
@@ -157,12 +175,14 @@ def run_chain_rebalance(*, options: ChainOptions, repo: RunCsvRepository, lm_cli
 
     if options.final_output_csv is not None:
         options.final_output_csv.parent.mkdir(parents=True, exist_ok=True)
-        options.final_output_csv.write_bytes(current_csv.read_bytes())
+        shutil.copyfile(current_csv, options.final_output_csv)
         print(f"Final output copied to: {options.final_output_csv}")
     else:
         print(f"Final output CSV: {current_csv}")
 
     _write_state(options.state_file, 8, current_csv, options)
+    # Renames are atomic per step; make the final one durable once.
+    _fsync_dir(options.state_file.parent)
 
     if options.reference_csv or options.anchor_l1_file:
         result = run_quality_audit(
@@ -180,28 +200,68 @@ def run_chain_rebalance(*, options: ChainOptions, repo: RunCsvRepository, lm_cli
     return current_csv
 
 
+@dataclass(frozen=True)
+class _LevelColumn:
+    level_column: str
+    # One entry per CSV row; rows whose level is not 1..5 never match a count.
+    levels: array
+
+
+def _load_level_column(csv_path: Path, repo: RunCsvRepository) -> _LevelColumn:
+    # Each step's CSV is queried several times; parse it once per on-disk version.
+    st = csv_path.stat()
+    return _read_level_column_cached(str(csv_path), st.st_mtime_ns, st.st_size, repo)
+
+
+@lru_cache(maxsize=2)
+def _read_level_column_cached(path: str, mtime_ns: int, size: int, repo: RunCsvRepository) -> _LevelColumn:
+    with repo.stream_table(Path(path)) as stream:
+        if "final_level" in stream.headers:
+            col = "final_level"
+        elif "rarity_level" in stream.headers:
+            col = "rarity_level"
+        else:
+            raise ValueError("CSV must contain final_level or rarity_level")
+        idx = stream.headers.index(col)
+        column = [rec.values[idx] for rec in stream.records]
+    levels = parse_digit_column(column)
+    if levels is None:
+        try:
+            levels = array("b", map(int, column))
+        except (ValueError, OverflowError):
+            levels = array("b", map(_parse_level_or_zero, column))
+    return _LevelColumn(level_column=col, levels=levels)
+
+
+def _parse_level_or_zero(raw: str) -> int:
+    try:
+        level = int(raw)
+    except Exception:
+        return 0
+    return level if 1 <= level <= 5 else 0
+
+
 def _count_total_words(csv_path: Path, repo: RunCsvRepository) -> int:
-    table = repo.read_table(csv_path)
-    return len(table.records)
+    # Not a raw newline count: quoted fields may span lines, and the first step
+    # needs this file's level column right after, so the parse is shared anyway.
+    return len(_load_level_column(csv_path, repo).levels)
 
 
-def _get_level_count(csv_path: Path, level: int, repo: RunCsvRepository) -> int:
-    table = repo.read_table(csv_path)
-    if "final_level" in table.headers:
-        col = "final_level"
-    elif "rarity_level" in table.headers:
-        col = "rarity_level"
-    else:
-        raise ValueError("CSV must contain final_level or rarity_level")
-    idx = table.headers.index(col)
-    count = 0
-    for rec in table.records:
-        try:
-            if int(rec.values[idx]) == level:
-                count += 1
-        except Exception:
-            continue
-    return count
+def _get_level_counts(csv_path: Path, repo: RunCsvRepository) -> RarityDistribution:
+    return RarityDistribution.from_levels(_load_level_column(csv_path, repo).levels)
+
+
+def _write_lines(lines: list[str]) -> None:
+    sys.stdout.write("\n".join(lines) + "\n")
+
+
+def _read_prompt(path: Path) -> str:
+    return _read_prompt_cached(str(path), path.stat().st_mtime_ns)
+
+
+@lru_cache(maxsize=8)
+def _read_prompt_cached(path: str, mtime_ns: int) -> str:
+    return Path(path).read_text(encoding="utf-8")
 
 
 def _write_state(path: Path, step: int, current_csv: Path, options: ChainOptions) -> None:
@@ -212,7 +272,23 @@ def _write_state(path: Path, step: int, current_csv: Path, options: ChainOptions
         f"run_base\t{options.run_base}",
         f"model\t{options.model}",
     ]
-    path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+    tmp = path.with_name(f"{path.name}.tmp")
+    with tmp.open("w", encoding="utf-8") as handle:
+        handle.write("\n".join(lines) + "\n")
+        handle.flush()
+        os.fsync(handle.fileno())
+    os.replace(tmp, path)
+
+
+def _fsync_dir(path: Path) -> None:
+    # Windows cannot open a directory for fsync, and its renames need no directory sync.
+    if os.name == "nt":
+        return
+    fd = os.open(path, os.O_RDONLY | getattr(os, "O_DIRECTORY", 0))
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
 
 
 def _load_state(path: Path) -> dict[str, object]:
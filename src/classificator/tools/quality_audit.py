@@ -1,9 +1,13 @@
 from __future__ import annotations
 
+from collections import Counter
 from dataclasses import dataclass
+from itertools import compress
+from operator import itemgetter
 from pathlib import Path
 
 from ..run_csv_repository import RunCsvRepository
+from ..support import parse_id_level_columns
 
 
 @dataclass(frozen=True)
@@ -47,7 +51,7 @@ def run_quality_audit(
 
     if reference_csv is not None:
         reference = _load_run(reference_csv, repo)
-        inter = len(candidate["l1_word_ids"].intersection(reference["l1_word_ids"]))
+        inter = _intersection_size(candidate["l1_word_ids"], reference["l1_word_ids"])
         union = len(candidate["l1_word_ids"]) + len(reference["l1_word_ids"]) - inter
         jaccard = _ratio(inter, union)
         l1_jaccard = jaccard
@@ -64,7 +68,7 @@ def run_quality_audit(
     anchor_recall = None
     if anchor_l1_file is not None:
         anchors = _load_anchor_words(anchor_l1_file)
-        inter = len(candidate["l1_words"].intersection(anchors))
+        inter = _intersection_size(candidate["l1_words"], anchors)
         precision = _ratio(inter, len(candidate["l1_words"]))
         recall = _ratio(inter, len(anchors))
         anchor_precision = precision
@@ -102,66 +106,72 @@ def run_quality_audit(
 
 
 def _load_run(path: Path, repo: RunCsvRepository) -> dict[str, object]:
-    table = repo.read_table(path)
-    if "word_id" not in table.headers or "word" not in table.headers:
-        raise ValueError(f"CSV must contain word_id and word: {path}")
-    if "final_level" in table.headers:
-        level_col = "final_level"
-    elif "rarity_level" in table.headers:
-        level_col = "rarity_level"
-    elif "median_level" in table.headers:
-        level_col = "median_level"
-    else:
-        raise ValueError("CSV missing level column: final_level/rarity_level/median_level")
-
-    distribution = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
-    l1_word_ids: set[int] = set()
-    l1_words: set[str] = set()
-    total_rows = 0
-
-    headers = table.headers
-    idx_word_id = headers.index("word_id")
-    idx_word = headers.index("word")
-    idx_level = headers.index(level_col)
-
-    for rec in table.records:
-        vals = rec.values
-        if len(vals) == 1 and vals[0] == "":
-            continue
-        total_rows += 1
-        word_id = int(vals[idx_word_id])
-        level = int(vals[idx_level])
-        if level < 1 or level > 5:
-            raise ValueError(f"Invalid level at row {rec.line_number} in {path}")
-        word = vals[idx_word].strip()
-        distribution[level] += 1
-        if level == 1:
-            l1_word_ids.add(word_id)
-            if word:
-                l1_words.add(word.lower())
+    with repo.stream_table(path) as stream:
+        headers = stream.headers
+        if "word_id" not in headers or "word" not in headers:
+            raise ValueError(f"CSV must contain word_id and word: {path}")
+        if "final_level" in headers:
+            level_col = "final_level"
+        elif "rarity_level" in headers:
+            level_col = "rarity_level"
+        elif "median_level" in headers:
+            level_col = "median_level"
+        else:
+            raise ValueError("CSV missing level column: final_level/rarity_level/median_level")
+
+        idx_word_id = headers.index("word_id")
+        idx_word = headers.index("word")
+        idx_level = headers.index(level_col)
+        rows = [rec.values for rec in stream.records]
+
+    word_ids, levels = parse_id_level_columns(
+        rows,
+        idx_word_id,
+        idx_level,
+        source=path,
+        raise_first_invalid=lambda: _raise_first_invalid_row(path, repo, idx_word_id, idx_level),
+    )
+
+    counts = Counter(levels)
+    distribution = {level: counts[level] for level in range(1, 6)}
+    # map/compress/filter chains keep the per-row iteration out of the bytecode loop.
+    l1_mask = list(map((1).__eq__, levels))
+    l1_word_ids = frozenset(compress(word_ids, l1_mask))
+    l1_words = frozenset(map(str.lower, filter(None, map(str.strip, map(itemgetter(idx_word), compress(rows, l1_mask))))))
 
     return {
         "path": str(path),
         "level_column": level_col,
-        "total_rows": total_rows,
+        "total_rows": len(rows),
         "distribution": distribution,
         "l1_word_ids": l1_word_ids,
         "l1_words": l1_words,
     }
 
 
-def _load_anchor_words(path: Path) -> set[str]:
-    words: set[str] = set()
-    for raw in path.read_text(encoding="utf-8").splitlines():
-        t = raw.strip()
-        if not t or t.startswith("#"):
-            continue
-        words.add(t.lower())
+def _raise_first_invalid_row(path: Path, repo: RunCsvRepository, idx_word_id: int, idx_level: int) -> None:
+    with repo.stream_table(path) as stream:
+        for rec in stream.records:
+            vals = rec.values
+            int(vals[idx_word_id])
+            level = int(vals[idx_level])
+            if level < 1 or level > 5:
+                raise ValueError(f"Invalid level at row {rec.line_number} in {path}")
+
+
+def _load_anchor_words(path: Path) -> frozenset[str]:
+    with path.open("r", encoding="utf-8") as handle:
+        words = frozenset(t.lower() for t in map(str.strip, handle) if t and not t.startswith("#"))
     if not words:
         raise ValueError(f"Anchor file has no usable words: {path}")
     return words
 
 
+def _intersection_size(a: frozenset, b: frozenset) -> int:
+    small, large = (a, b) if len(a) <= len(b) else (b, a)
+    return len(small & large)
+
+
 def _ratio(n: int, d: int) -> float:
     if d <= 0:
         return 0.0
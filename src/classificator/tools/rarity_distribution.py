@@ -1,7 +1,9 @@
 from __future__ import annotations
 
+from collections import Counter
 from dataclasses import dataclass
 from pathlib import Path
+from typing import NoReturn
 
 from ..run_csv_repository import RunCsvRepository
 
@@ -22,28 +24,23 @@ def run_rarity_distribution(
     repo: RunCsvRepository,
     level_column: str | None = None,
 ) -> RarityDistributionResult:
-    table = repo.read_table(csv_path)
-    resolved_level_col = _resolve_level_column(table.headers, level_column)
-    idx_level = table.headers.index(resolved_level_col)
+    with repo.stream_table(csv_path) as stream:
+        resolved_level_col = _resolve_level_column(stream.headers, level_column)
+        idx_level = stream.headers.index(resolved_level_col)
+        # Tally raw cell values in C; only the handful of distinct values get parsed.
+        raw_counts = Counter([rec.values[idx_level] for rec in stream.records])
 
     distribution = {1: 0, 2: 0, 3: 0, 4: 0, 5: 0}
     total_rows = 0
-
-    for rec in table.records:
-        vals = rec.values
-        if len(vals) == 1 and vals[0] == "":
-            continue
-        total_rows += 1
-        if idx_level >= len(vals):
-            raise ValueError(f"Missing {resolved_level_col} at row {rec.line_number} in {csv_path}")
-        raw_level = vals[idx_level].strip()
+    for raw_level, count in raw_counts.items():
         try:
-            level = int(raw_level)
-        except Exception as exc:
-            raise ValueError(f"Invalid {resolved_level_col} '{raw_level}' at row {rec.line_number} in {csv_path}") from exc
+            level = int(raw_level.strip())
+        except ValueError:
+            level = 0
         if level < 1 or level > 5:
-            raise ValueError(f"Invalid {resolved_level_col} {level} at row {rec.line_number} in {csv_path}")
-        distribution[level] += 1
+            _raise_first_invalid_level(csv_path, repo, idx_level, resolved_level_col)
+        distribution[level] += count
+        total_rows += count
 
     print(f"input_csv={csv_path}")
     print(f"level_column={resolved_level_col}")
@@ -51,14 +48,9 @@ def run_rarity_distribution(
         f"distribution=[1:{distribution[1]} 2:{distribution[2]} 3:{distribution[3]} "
         f"4:{distribution[4]} 5:{distribution[5]}] total={total_rows}"
     )
-    print(
-        "distribution_pct=["
-        f"1:{_pct(distribution[1], total_rows):.2f}% "
-        f"2:{_pct(distribution[2], total_rows):.2f}% "
-        f"3:{_pct(distribution[3], total_rows):.2f}% "
-        f"4:{_pct(distribution[4], total_rows):.2f}% "
-        f"5:{_pct(distribution[5], total_rows):.2f}%]"
-    )
+    scale, divisor = (100.0, total_rows) if total_rows > 0 else (0.0, 1)
+    pct_parts = " ".join(f"{level}:{count * scale / divisor:.2f}%" for level, count in distribution.items())
+    print(f"distribution_pct=[{pct_parts}]")
 
     return RarityDistributionResult(
         csv_path=csv_path,
@@ -68,6 +60,20 @@ def run_rarity_distribution(
     )
 
 
+def _raise_first_invalid_level(csv_path: Path, repo: RunCsvRepository, idx_level: int, level_col: str) -> NoReturn:
+    with repo.stream_table(csv_path) as stream:
+        for rec in stream.records:
+            raw_level = rec.values[idx_level].strip()
+            try:
+                level = int(raw_level)
+            except Exception as exc:
+                raise ValueError(f"Invalid {level_col} '{raw_level}' at row {rec.line_number} in {csv_path}") from exc
+            if level < 1 or level > 5:
+                raise ValueError(f"Invalid {level_col} {level} at row {rec.line_number} in {csv_path}")
+    # The tally saw an invalid level; never let the caller histogram it.
+    raise ValueError(f"Invalid {level_col} values in {csv_path}")
+
+
 def _resolve_level_column(headers: list[str], level_column: str | None) -> str:
     if level_column:
         if level_column not in headers:
@@ -78,8 +84,3 @@ def _resolve_level_column(headers: list[str], level_column: str | None) -> str:
             return col
     raise ValueError("CSV missing level column: final_level/rarity_level/median_level")
 
-
-def _pct(part: int, total: int) -> float:
-    if total <= 0:
-        return 0.0
-    return (part * 100.0) / total
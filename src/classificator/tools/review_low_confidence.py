@@ -1,17 +1,52 @@
 from __future__ import annotations
 
 import csv
+import os
+import re
+from collections.abc import Iterator
+from contextlib import ExitStack, contextmanager
 from dataclasses import dataclass
 from datetime import datetime, timezone
+from functools import lru_cache
+from itertools import compress
+from operator import attrgetter
 from pathlib import Path
+from typing import Any, NoReturn, TextIO
 
+from ..csv_codec import CsvRecord, CsvTable
 from ..run_csv_repository import RunCsvRepository
+from ..support import parse_id_level_columns
 
 _DEFAULT_LEVEL_COLUMNS = ("final_level", "rarity_level", "median_level")
 _DECIDED_LABELS = {"1", "2", "3", "unknown_4_5"}
-
-
-@dataclass(frozen=True)
+_INPUT_LABELS = {
+    "1": "1",
+    "2": "2",
+    "3": "3",
+    "u": "unknown_4_5",
+    "unknown": "unknown_4_5",
+    "d": "undecided",
+    "undecided": "undecided",
+    "s": "skip",
+    "skip": "skip",
+    "q": "quit",
+    "quit": "quit",
+    "exit": "quit",
+}
+_NEEDS_QUOTES = re.compile(r'[",\r\n]')
+_LABEL_HEADERS = [
+    "ts_utc",
+    "run_csv",
+    "word_id",
+    "word",
+    "type",
+    "predicted_level",
+    "predicted_confidence",
+    "label",
+]
+
+
+@dataclass(frozen=True, slots=True)
 class ReviewItem:
     word_id: int
     word: str
@@ -20,14 +55,14 @@ class ReviewItem:
     predicted_confidence: float
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ReviewLabel:
     word_id: int
     predicted_level: int
     label: str
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class L1ReviewStats:
     reviewed_decided: int
     accepted_level1: int
@@ -63,44 +98,50 @@ def run_review_low_confidence(
     print("labels: 1 | 2 | 3 | u=unknown(4/5) | d=undecided | s=skip | q=quit")
 
     if not queue:
-        _print_l1_summary(latest)
+        _print_l1_summary(compute_l1_review_stats(latest))
         return
 
     session_labeled = 0
-    for idx, item in enumerate(queue, start=1):
-        print(
-            f"[{idx}/{len(queue)}] word_id={item.word_id} word='{item.word}' type={item.type} "
-            f"pred_level={item.predicted_level} confidence={item.predicted_confidence:.4f}"
-        )
-        while True:
-            raw = input("label> ").strip().lower()
-            mapped = _map_input_to_label(raw)
-            if mapped is None:
-                print("Invalid input. Use: 1,2,3,u,d,s,q")
-                continue
-            if mapped == "quit":
-                latest = load_latest_review_labels(labels_csv)
-                print(f"session_labeled={session_labeled}")
-                _print_l1_summary(latest)
-                return
-            if mapped == "skip":
-                break
-            append_review_label(
-                labels_csv=labels_csv,
-                run_csv=csv_path,
-                item=item,
-                label=mapped,
-            )
-            latest[item.word_id] = ReviewLabel(
-                word_id=item.word_id,
-                predicted_level=item.predicted_level,
-                label=mapped,
+    with ExitStack() as stack:
+        # The labels file is opened on the first label and then kept open for the session.
+        label_writer = None
+        for idx, item in enumerate(queue, start=1):
+            print(
+                f"[{idx}/{len(queue)}] word_id={item.word_id} word='{item.word}' type={item.type} "
+                f"pred_level={item.predicted_level} confidence={item.predicted_confidence:.4f}"
             )
-            session_labeled += 1
-            break
+            while True:
+                raw = input("label> ").strip().lower()
+                mapped = _map_input_to_label(raw)
+                if mapped is None:
+                    print("Invalid input. Use: 1,2,3,u,d,s,q")
+                    continue
+                if mapped == "quit":
+                    # latest already holds every label appended this session.
+                    print(f"session_labeled={session_labeled}")
+                    _print_l1_summary(compute_l1_review_stats(latest))
+                    return
+                if mapped == "skip":
+                    break
+                if label_writer is None:
+                    label_writer = stack.enter_context(open_review_label_writer(labels_csv))
+                append_review_label(
+                    labels_csv=labels_csv,
+                    run_csv=csv_path,
+                    item=item,
+                    label=mapped,
+                    writer=label_writer,
+                )
+                latest[item.word_id] = ReviewLabel(
+                    word_id=item.word_id,
+                    predicted_level=item.predicted_level,
+                    label=mapped,
+                )
+                session_labeled += 1
+                break
 
     print(f"session_labeled={session_labeled}")
-    _print_l1_summary(latest)
+    _print_l1_summary(compute_l1_review_stats(latest))
 
 
 def run_l1_review_check(
@@ -112,9 +153,7 @@ def run_l1_review_check(
     latest = load_latest_review_labels(labels_csv)
     stats = compute_l1_review_stats(latest)
     print(f"labels_csv={labels_csv}")
-    print(f"l1_reviewed_decided={stats.reviewed_decided}")
-    print(f"l1_accepted={stats.accepted_level1}")
-    print(f"l1_precision={stats.precision:.4f}")
+    _print_l1_summary(stats)
 
     failures: list[str] = []
     if min_reviewed is not None and stats.reviewed_decided < min_reviewed:
@@ -140,45 +179,90 @@ def load_review_items(
     confidence_column: str = "confidence",
     only_levels: set[int] | None = None,
 ) -> list[ReviewItem]:
-    table = repo.read_table(csv_path)
-    level_col = _resolve_level_column(table.headers, level_column)
-    idx_word_id = _require_col(table.headers, "word_id")
-    idx_word = _require_col(table.headers, "word")
-    idx_type = table.headers.index("type") if "type" in table.headers else None
-    idx_level = table.headers.index(level_col)
-    idx_conf = table.headers.index(confidence_column) if confidence_column in table.headers else None
-
-    items: list[ReviewItem] = []
-    for rec in table.records:
+    return parse_review_items(
+        repo.read_table(csv_path),
+        csv_path=csv_path,
+        level_column=level_column,
+        confidence_column=confidence_column,
+        only_levels=only_levels,
+    )
+
+
+def parse_review_items(
+    table: CsvTable,
+    *,
+    csv_path: Path,
+    level_column: str | None = None,
+    confidence_column: str = "confidence",
+    only_levels: set[int] | None = None,
+) -> list[ReviewItem]:
+    headers = table.headers
+    level_col = _resolve_level_column(headers, level_column)
+    idx_word_id = _require_col(headers, "word_id")
+    idx_word = _require_col(headers, "word")
+    idx_type = headers.index("type") if "type" in headers else None
+    idx_level = headers.index(level_col)
+    idx_conf = headers.index(confidence_column) if confidence_column in headers else None
+    records = table.records
+
+    def raise_first_invalid() -> None:
+        _raise_first_invalid_item(records, csv_path, level_col, confidence_column, only_levels, idx_word_id, idx_level, idx_conf)
+
+    rows = [rec.values for rec in records]
+    word_ids, levels = parse_id_level_columns(
+        rows, idx_word_id, idx_level, source=csv_path, raise_first_invalid=raise_first_invalid
+    )
+
+    if only_levels is not None:
+        # Levels are validated to 1..5, so one translate over their bytes yields the keep mask.
+        keep = bytes(levels).translate(bytes(level in only_levels for level in range(256)))
+        rows = list(compress(rows, keep))
+        word_ids = list(compress(word_ids, keep))
+        levels = list(compress(levels, keep))
+
+    if idx_conf is None:
+        confidences = [1.0] * len(rows)
+    else:
+        try:
+            confidences = list(map(float, [vals[idx_conf] for vals in rows]))
+        except ValueError:
+            confidences = None
+        if confidences is None or any(c < 0.0 or c > 1.0 for c in confidences):
+            raise_first_invalid()
+
+    words = [vals[idx_word].strip() for vals in rows]
+    types = [vals[idx_type].strip() for vals in rows] if idx_type is not None else [""] * len(rows)
+    items = list(map(ReviewItem, word_ids, words, types, levels, confidences))
+    items.sort(key=attrgetter("predicted_confidence", "word_id"))
+    return items
+
+
+def _raise_first_invalid_item(
+    records: list[CsvRecord],
+    csv_path: Path,
+    level_col: str,
+    confidence_column: str,
+    only_levels: set[int] | None,
+    idx_word_id: int,
+    idx_level: int,
+    idx_conf: int | None,
+) -> NoReturn:
+    for rec in records:
         vals = rec.values
-        if len(vals) == 1 and vals[0] == "":
-            continue
-        word_id = _parse_int(vals[idx_word_id], f"word_id at row {rec.line_number} in {csv_path}")
-        word = vals[idx_word].strip()
-        wtype = vals[idx_type].strip() if idx_type is not None else ""
+        _parse_int(vals[idx_word_id], f"word_id at row {rec.line_number} in {csv_path}")
         level = _parse_int(vals[idx_level], f"{level_col} at row {rec.line_number} in {csv_path}")
         if level < 1 or level > 5:
             raise ValueError(f"Invalid {level_col} {level} at row {rec.line_number} in {csv_path}")
         if only_levels is not None and level not in only_levels:
             continue
-        confidence = 1.0
         if idx_conf is not None:
             confidence = _parse_float(vals[idx_conf], f"{confidence_column} at row {rec.line_number} in {csv_path}")
             if confidence < 0.0 or confidence > 1.0:
                 raise ValueError(
                     f"Invalid {confidence_column} {confidence} at row {rec.line_number} in {csv_path}"
                 )
-        items.append(
-            ReviewItem(
-                word_id=word_id,
-                word=word,
-                type=wtype,
-                predicted_level=level,
-                predicted_confidence=confidence,
-            )
-        )
-    items.sort(key=lambda i: (i.predicted_confidence, i.word_id))
-    return items
+    # The bulk parse rejected the table, so never fall through with unparsed columns.
+    raise ValueError(f"Invalid rows in {csv_path}")
 
 
 def parse_only_levels(raw: str | None) -> set[int] | None:
@@ -202,16 +286,36 @@ def parse_only_levels(raw: str | None) -> set[int] | None:
 
 
 def load_latest_review_labels(labels_csv: Path) -> dict[int, ReviewLabel]:
-    if not labels_csv.exists():
+    try:
+        st = labels_csv.stat()
+    except FileNotFoundError:
         return {}
+    # Re-parse only when the file changed; callers get their own copy to mutate.
+    return dict(_load_latest_review_labels_cached(str(labels_csv), st.st_mtime_ns, st.st_size))
+
+
+@lru_cache(maxsize=2)
+def _load_latest_review_labels_cached(path: str, mtime_ns: int, size: int) -> dict[int, ReviewLabel]:
+    labels_csv = Path(path)
     latest: dict[int, ReviewLabel] = {}
     with labels_csv.open("r", encoding="utf-8", newline="") as handle:
-        reader = csv.DictReader(handle)
+        reader = csv.reader(handle)
+        header = next(reader, None)
+        if header is None:
+            return {}
+        # A missing column points one past the header; short rows are padded to reach it.
+        idx_word_id, idx_level, idx_label = (
+            header.index(col) if col in header else len(header) for col in ("word_id", "predicted_level", "label")
+        )
+        needed = max(idx_word_id, idx_level, idx_label) + 1
         for row in reader:
-            word_id = _parse_int(row.get("word_id", ""), f"word_id in {labels_csv}")
-            predicted_level = _parse_int(row.get("predicted_level", ""), f"predicted_level in {labels_csv}")
-            label = (row.get("label", "") or "").strip()
-            latest[word_id] = ReviewLabel(word_id=word_id, predicted_level=predicted_level, label=label)
+            if not row:
+                continue
+            if len(row) < needed:
+                row.extend([""] * (needed - len(row)))
+            word_id = _parse_int(row[idx_word_id], f"word_id in {labels_csv}")
+            predicted_level = _parse_int(row[idx_level], f"predicted_level in {labels_csv}")
+            latest[word_id] = ReviewLabel(word_id=word_id, predicted_level=predicted_level, label=row[idx_label].strip())
     return latest
 
 
@@ -221,47 +325,63 @@ def build_review_queue(
     *,
     include_undecided: bool,
 ) -> list[ReviewItem]:
-    out: list[ReviewItem] = []
-    for item in items:
-        label = latest_labels.get(item.word_id)
-        if label is None:
-            out.append(item)
-            continue
-        if include_undecided and label.label == "undecided":
-            out.append(item)
-    return out
+    # Labeled items leave the queue, except undecided ones when those are requested.
+    if include_undecided:
+        excluded = {wid for wid, label in latest_labels.items() if label.label != "undecided"}
+    else:
+        excluded = latest_labels.keys()
+    return [item for item in items if item.word_id not in excluded]
 
 
-def append_review_label(*, labels_csv: Path, run_csv: Path, item: ReviewItem, label: str) -> None:
+@contextmanager
+def open_review_label_writer(labels_csv: Path) -> Iterator[Any]:
     labels_csv.parent.mkdir(parents=True, exist_ok=True)
-    exists = labels_csv.exists()
-    with labels_csv.open("a", encoding="utf-8", newline="") as handle:
-        writer = csv.writer(handle, quoting=csv.QUOTE_MINIMAL)
-        if not exists:
-            writer.writerow(
-                [
-                    "ts_utc",
-                    "run_csv",
-                    "word_id",
-                    "word",
-                    "type",
-                    "predicted_level",
-                    "predicted_confidence",
-                    "label",
-                ]
-            )
-        writer.writerow(
-            [
-                datetime.now(tz=timezone.utc).isoformat(),
-                str(run_csv),
-                str(item.word_id),
-                item.word,
-                item.type,
-                str(item.predicted_level),
-                f"{item.predicted_confidence:.6f}",
-                label,
-            ]
-        )
+    # Line buffered so every label reaches the file as soon as it is entered.
+    with labels_csv.open("a", encoding="utf-8", newline="", buffering=1) as handle:
+        writer = _LabelLineWriter(handle)
+        # Decide on the header from the opened file itself, not a separate exists() check.
+        if os.fstat(handle.fileno()).st_size == 0:
+            writer.writerow(_LABEL_HEADERS)
+        yield writer
+
+
+def append_review_label(*, labels_csv: Path, run_csv: Path, item: ReviewItem, label: str, writer: Any = None) -> None:
+    if writer is None:
+        with open_review_label_writer(labels_csv) as opened:
+            _write_review_label(opened, run_csv, item, label)
+        return
+    _write_review_label(writer, run_csv, item, label)
+
+
+def _write_review_label(writer: Any, run_csv: Path, item: ReviewItem, label: str) -> None:
+    writer.writerow(
+        [
+            datetime.now(tz=timezone.utc).isoformat(),
+            str(run_csv),
+            str(item.word_id),
+            item.word,
+            item.type,
+            str(item.predicted_level),
+            f"{item.predicted_confidence:.6f}",
+            label,
+        ]
+    )
+
+
+class _LabelLineWriter:
+    # Produces the same bytes as csv.writer(QUOTE_MINIMAL) for string cells, with the
+    # quoting decision made by one regex search per cell instead of csv's field scan.
+    def __init__(self, handle: TextIO) -> None:
+        self._handle = handle
+
+    def writerow(self, row: list[str]) -> None:
+        self._handle.write(",".join(map(_quote_minimal, row)) + "\r\n")
+
+
+def _quote_minimal(value: str) -> str:
+    if _NEEDS_QUOTES.search(value) is None:
+        return value
+    return '"' + value.replace('"', '""') + '"'
 
 
 def compute_l1_review_stats(latest_labels: dict[int, ReviewLabel]) -> L1ReviewStats:
@@ -283,25 +403,14 @@ def compute_l1_review_stats(latest_labels: dict[int, ReviewLabel]) -> L1ReviewSt
     )
 
 
-def _print_l1_summary(latest: dict[int, ReviewLabel]) -> None:
-    stats = compute_l1_review_stats(latest)
+def _print_l1_summary(stats: L1ReviewStats) -> None:
     print(f"l1_reviewed_decided={stats.reviewed_decided}")
     print(f"l1_accepted={stats.accepted_level1}")
     print(f"l1_precision={stats.precision:.4f}")
 
 
 def _map_input_to_label(raw: str) -> str | None:
-    if raw in {"1", "2", "3"}:
-        return raw
-    if raw in {"u", "unknown"}:
-        return "unknown_4_5"
-    if raw in {"d", "undecided"}:
-        return "undecided"
-    if raw in {"s", "skip"}:
-        return "skip"
-    if raw in {"q", "quit", "exit"}:
-        return "quit"
-    return None
+    return _INPUT_LABELS.get(raw)
 
 
 def _resolve_level_column(headers: list[str], level_column: str | None) -> str:
@@ -54,15 +54,19 @@ def require_valid_pair_transition(from_lower: int, from_upper: int, to_level: in
 def validate_transition_set(transitions: list[LevelTransition]) -> None:
     if not transitions:
         raise ValueError("At least one transition is required")
-    seen: dict[int, int] = {}
-    duplicates: set[int] = set()
-    for idx, t in enumerate(transitions):
+    # Levels are 1..5, so fixed slots replace the dict/set bookkeeping: owner holds
+    # the 1-based index of the transition that last claimed a level.
+    owner = [0] * 6
+    duplicated = bytearray(6)
+    for idx, t in enumerate(transitions, start=1):
         for level in t.source_levels():
-            if level in seen and seen[level] != idx:
-                duplicates.add(level)
-            seen[level] = idx
-    if duplicates:
-        dup = ", ".join(str(x) for x in sorted(duplicates))
+            if not 1 <= level <= 5:
+                raise ValueError(f"Transition source level {level} out of range 1..5")
+            if owner[level] and owner[level] != idx:
+                duplicated[level] = 1
+            owner[level] = idx
+    if any(duplicated):
+        dup = ", ".join(str(level) for level in range(1, 6) if duplicated[level])
         raise ValueError(f"Transitions must not overlap source levels: {dup}")
 
 
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+from contextlib import ExitStack
 from datetime import datetime, timezone
 from pathlib import Path
 
@@ -51,33 +52,40 @@ class UploadMarkerWriter:
         upload_batch_id: str,
         uploaded_at: str,
     ) -> UploadMarkerResult:
-        table = self.repo.read_table(final_csv_path)
-        if "word_id" not in table.headers:
-            raise ValueError(f"CSV {final_csv_path} missing word_id")
-
-        headers = table.headers + [h for h in UPLOAD_MARKER_HEADERS if h not in table.headers]
-        rows: list[list[str]] = []
         marked = 0
+        with ExitStack() as reading:
+            stream = reading.enter_context(self.repo.stream_table(final_csv_path))
+            if "word_id" not in stream.headers:
+                raise ValueError(f"CSV {final_csv_path} missing word_id")
+
+            idx_word_id = stream.headers.index("word_id")
+            headers = stream.headers + [h for h in UPLOAD_MARKER_HEADERS if h not in stream.headers]
+            pad = [""] * (len(headers) - len(stream.headers))
+            idx_at, idx_level, idx_status, idx_batch = (headers.index(h) for h in UPLOAD_MARKER_HEADERS)
+            # Only five distinct levels exist; format each once instead of per marked row.
+            level_text = {level: str(level) for level in set(uploaded_levels.values())}
 
-        for rec in table.records:
-            row = dict(zip(table.headers, rec.values))
-            try:
-                word_id = int(row.get("word_id", ""))
-            except Exception:
-                word_id = None
-            status = status_by_word_id.get(word_id) if word_id is not None else None
-            if status is not None:
-                row["uploaded_at"] = uploaded_at
-                row["uploaded_level"] = str(uploaded_levels.get(word_id, ""))
-                row["upload_status"] = status
-                row["upload_batch_id"] = upload_batch_id
-                marked += 1
-            else:
-                for k in UPLOAD_MARKER_HEADERS:
-                    row.setdefault(k, "")
-            rows.append([row.get(h, "") for h in headers])
+            # Rows are rewritten one at a time from the source into the temp file.
+            with self.repo.open_table_writer(final_csv_path, headers) as sink:
+                for rec in stream.records:
+                    # Existing marker cells are kept on rows that are not part of this upload.
+                    row = rec.values + pad
+                    try:
+                        word_id = int(row[idx_word_id])
+                    except Exception:
+                        word_id = None
+                    status = status_by_word_id.get(word_id) if word_id is not None else None
+                    if status is not None:
+                        row[idx_at] = uploaded_at
+                        row[idx_level] = level_text.get(uploaded_levels.get(word_id), "")
+                        row[idx_status] = status
+                        row[idx_batch] = upload_batch_id
+                        marked += 1
+                    sink.write(row)
+                # Close the source before the writer replaces it; some platforms refuse
+                # to replace a file that is still open.
+                reading.close()
 
-        self.repo.write_table_atomic(final_csv_path, headers, rows)
         return UploadMarkerResult(marker_path=final_csv_path, used_companion_file=False, marked_rows=marked)
 
     def _write_companion(
@@ -91,14 +99,19 @@ class UploadMarkerWriter:
     ) -> UploadMarkerResult:
         companion = final_csv_path.with_name(f"{final_csv_path.name}.upload_markers.csv")
         headers = ["word_id", *UPLOAD_MARKER_HEADERS]
-        rows = []
-        for word_id, status in sorted(status_by_word_id.items()):
-            rows.append([
+        level_text = {level: str(level) for level in set(uploaded_levels.values())}
+        # Sorting bare ids is linear when Step4 already built the map in id order.
+        rows = (
+            [
                 str(word_id),
                 uploaded_at,
-                str(uploaded_levels.get(word_id, "")),
-                status,
+                level_text.get(uploaded_levels.get(word_id), ""),
+                status_by_word_id[word_id],
                 upload_batch_id,
-            ])
-        self.repo.write_rows(companion, headers, rows)
-        return UploadMarkerResult(marker_path=companion, used_companion_file=True, marked_rows=len(rows))
+            ]
+            for word_id in sorted(status_by_word_id)
+        )
+        # The codec's buffered writer batches rows into large writes, and the temp-file
+        # rename means a reader never sees a half-written companion.
+        self.repo.write_table_atomic(companion, headers, rows)
+        return UploadMarkerResult(marker_path=companion, used_companion_file=True, marked_rows=len(status_by_word_id))
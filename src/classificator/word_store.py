@@ -1,9 +1,25 @@
 from __future__ import annotations
 
 import os
+from collections.abc import Iterator
+from contextlib import AbstractContextManager, nullcontext
 
 from .models import BaseWordRow, WordLevel
 
+try:
+    from psycopg import Pipeline as _Pipeline
+except ModuleNotFoundError:
+    _Pipeline = None
+
+_FETCH_ITERSIZE = 10_000
+
+# Parallel id/level arrays are unnested server-side, so a whole chunk is a single statement.
+_UPDATE_LEVELS_SQL = (
+    "UPDATE words SET rarity_level = v.rarity_level "
+    "FROM unnest(%s::bigint[], %s::int[]) AS v(id, rarity_level) "
+    "WHERE words.id = v.id"
+)
+
 
 class WordStore:
     def __init__(
@@ -25,32 +41,43 @@ class WordStore:
             ) from exc
         return psycopg.connect(self.db_url, user=self.db_user, password=self.db_password, autocommit=False)
 
-    def fetch_all_words(self) -> list[BaseWordRow]:
-        with self._connect() as conn, conn.cursor() as cur:
+    def fetch_all_words(self) -> Iterator[BaseWordRow]:
+        # Server-side cursor: rows arrive in itersize batches instead of one fetchall().
+        with self._connect() as conn, conn.cursor(name="fetch_all_words") as cur:
+            cur.itersize = _FETCH_ITERSIZE
             cur.execute("SELECT id, word, type FROM words ORDER BY id")
-            rows = cur.fetchall()
-        return [BaseWordRow(word_id=r[0], word=r[1], type=r[2]) for r in rows]
+            for r in cur:
+                yield BaseWordRow(word_id=r[0], word=r[1], type=r[2])
 
-    def fetch_all_word_levels(self) -> list[WordLevel]:
-        with self._connect() as conn, conn.cursor() as cur:
+    def fetch_all_word_levels(self) -> Iterator[WordLevel]:
+        with self._connect() as conn, conn.cursor(name="fetch_all_word_levels") as cur:
+            cur.itersize = _FETCH_ITERSIZE
             cur.execute("SELECT id, rarity_level FROM words ORDER BY id")
-            rows = cur.fetchall()
-        return [WordLevel(word_id=r[0], rarity_level=r[1]) for r in rows]
+            for r in cur:
+                yield WordLevel(word_id=r[0], rarity_level=r[1])
 
     def update_rarity_levels(self, updates: dict[int, int]) -> None:
         if not updates:
             return
         with self._connect() as conn, conn.cursor() as cur:
-            payload = [(level, word_id) for word_id, level in updates.items()]
-            cur.executemany("UPDATE words SET rarity_level = %s WHERE id = %s", payload)
+            cur.execute(_UPDATE_LEVELS_SQL, (list(updates.keys()), list(updates.values())))
             conn.commit()
 
     def update_rarity_levels_chunked(self, updates: dict[int, int], chunk_size: int = 5000) -> None:
         if not updates:
             return
-        items = list(updates.items())
-        with self._connect() as conn, conn.cursor() as cur:
-            for i in range(0, len(items), chunk_size):
-                chunk = items[i : i + chunk_size]
-                cur.executemany("UPDATE words SET rarity_level = %s WHERE id = %s", [(lvl, wid) for wid, lvl in chunk])
+        word_ids = list(updates.keys())
+        levels = list(updates.values())
+        with self._connect() as conn, _pipeline(conn), conn.cursor() as cur:
+            # One set-based UPDATE per chunk instead of one statement per word; in pipeline
+            # mode the chunks are sent back to back without waiting on each result.
+            for i in range(0, len(word_ids), chunk_size):
+                cur.execute(_UPDATE_LEVELS_SQL, (word_ids[i : i + chunk_size], levels[i : i + chunk_size]))
             conn.commit()
+
+
+def _pipeline(conn) -> AbstractContextManager[object]:
+    # Pipeline mode needs libpq 14+; older clients fall back to one round trip per chunk.
+    if _Pipeline is None or not _Pipeline.is_supported():
+        return nullcontext()
+    return conn.pipeline()
@@ -8,8 +8,9 @@ from classificator.tools.build_retry_input import build_retry_input
 
 
 class BuildRetryInputTest(unittest.TestCase):
-    def setUp(self):
-        self.repo = RunCsvRepository()
+    @classmethod
+    def setUpClass(cls):
+        cls.repo = RunCsvRepository()
 
     def test_build_retry_input_selects_failed_word_ids(self):
         with tempfile.TemporaryDirectory() as td:
@@ -45,6 +46,30 @@ class BuildRetryInputTest(unittest.TestCase):
             ids = [int(rec.values[0]) for rec in table.records]
             self.assertEqual(ids, [2, 4])
 
+    def test_build_retry_input_reads_client_failed_lines(self):
+        with tempfile.TemporaryDirectory() as td:
+            root = Path(td)
+            failed = root / "failed.jsonl"
+            base = root / "base.csv"
+            out = root / "retry.csv"
+
+            rows = [
+                {"ts": "2026-01-01T00:00:00+00:00", "run": "r", "word_id": 3, "word": "trei", "error": "x"},
+                {"ts": "2026-01-01T00:00:00+00:00", "run": "r", "word_id": "1", "error": "str id"},
+                {"run": "r", "nested": {"word_id": 4}},
+            ]
+            failed.write_text("\n".join(json.dumps(r, ensure_ascii=False) for r in rows) + "\n", encoding="utf-8")
+            self.repo.write_rows(
+                base,
+                ["word_id", "word", "type"],
+                [["1", "unu", "N"], ["3", "trei", "N"], ["4", "patru", "N"]],
+            )
+
+            count = build_retry_input(failed_jsonl=failed, base_csv=base, output_csv=out, repo=self.repo)
+            self.assertEqual(count, 2)
+            ids = [int(rec.values[0]) for rec in self.repo.read_table(out).records]
+            self.assertEqual(ids, [1, 3])
+
 
 if __name__ == "__main__":
     unittest.main()
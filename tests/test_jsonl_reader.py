@@ -0,0 +1,22 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from classificator import jsonl_reader
+from classificator.jsonl_reader import iter_jsonl_lines
+
+
+class JsonlReaderTest(unittest.TestCase):
+    def test_yields_stripped_lines_across_chunk_boundaries(self):
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "log.jsonl"
+            path.write_bytes(b'{"a": 1}\n\n  {"b": "\xc8\x9b"}\r\n{"c": 3}')
+            with mock.patch.object(jsonl_reader, "_READ_CHUNK_BYTES", 4):
+                lines = list(iter_jsonl_lines(path))
+            self.assertEqual(lines, [b'{"a": 1}', b'{"b": "\xc8\x9b"}', b'{"c": 3}'])
+            self.assertEqual(list(iter_jsonl_lines(path, offset=9)), lines[1:])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -7,8 +7,9 @@ from classificator.tools.quality_audit import run_quality_audit
 
 
 class QualityAuditTest(unittest.TestCase):
-    def setUp(self):
-        self.repo = RunCsvRepository()
+    @classmethod
+    def setUpClass(cls):
+        cls.repo = RunCsvRepository()
 
     def _write_csv(self, path: Path, headers: list[str], rows: list[list[str]]):
         self.repo.write_rows(path, headers, rows)
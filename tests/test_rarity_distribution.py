@@ -3,12 +3,13 @@ import unittest
 from pathlib import Path
 
 from classificator.run_csv_repository import RunCsvRepository
-from classificator.tools.rarity_distribution import run_rarity_distribution
+from classificator.tools.rarity_distribution import _raise_first_invalid_level, run_rarity_distribution
 
 
 class RarityDistributionTest(unittest.TestCase):
-    def setUp(self):
-        self.repo = RunCsvRepository()
+    @classmethod
+    def setUpClass(cls):
+        cls.repo = RunCsvRepository()
 
     def _write_csv(self, path: Path, headers: list[str], rows: list[list[str]]):
         self.repo.write_rows(path, headers, rows)
@@ -29,6 +30,13 @@ class RarityDistributionTest(unittest.TestCase):
             self.assertEqual(result.distribution[2], 1)
             self.assertEqual(result.distribution[5], 1)
 
+    def test_invalid_level_rescan_always_raises(self):
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "run.csv"
+            self._write_csv(path, ["word_id", "rarity_level"], [["1", "1"], ["2", "5"]])
+            with self.assertRaisesRegex(ValueError, "Invalid rarity_level values in"):
+                _raise_first_invalid_level(path, self.repo, 1, "rarity_level")
+
     def test_can_use_explicit_level_column(self):
         with tempfile.TemporaryDirectory() as td:
             root = Path(td)
@@ -5,52 +5,46 @@ from classificator.lm.response_parser import LmStudioResponseParser
 from classificator.models import BaseWordRow, ScoringOutputMode
 
 
+# Fixed chat-completion scaffolding; only the JSON-encoded content string varies.
+_RESPONSE_TEMPLATE = '{"choices": [{"message": {"content": %s}}]}'
+
+
 class ResponseParserTest(unittest.TestCase):
-    def setUp(self):
-        self.parser = LmStudioResponseParser()
-        self.batch = [
+    @classmethod
+    def setUpClass(cls):
+        # The parser is stateless without metrics, so every test can share it and the batch.
+        cls.parser = LmStudioResponseParser()
+        cls.batch = [
             BaseWordRow(word_id=101, word="om", type="N"),
             BaseWordRow(word_id=102, word="casă", type="N"),
         ]
 
     def _wrap_content(self, content: str) -> str:
-        payload = {"choices": [{"message": {"content": content}}]}
-        return json.dumps(payload, ensure_ascii=False)
-
-    def test_selected_word_ids_accepts_valid_local_id(self):
-        body = self._wrap_content("[1]")
-        parsed = self.parser.parse(
-            batch=self.batch,
-            response_body=body,
-            output_mode=ScoringOutputMode.SELECTED_WORD_IDS,
-            forced_rarity_level=1,
-            expected_items=1,
-        )
-        self.assertEqual(len(parsed.scores), 1)
-        self.assertEqual(parsed.scores[0].word_id, 101)
-        self.assertEqual(parsed.scores[0].rarity_level, 1)
-
-    def test_selected_word_ids_rejects_out_of_range_ids(self):
-        body = self._wrap_content("[999]")
-        with self.assertRaises(RuntimeError):
-            self.parser.parse(
-                batch=self.batch,
-                response_body=body,
-                output_mode=ScoringOutputMode.SELECTED_WORD_IDS,
-                forced_rarity_level=1,
-                expected_items=1,
-            )
-
-    def test_selected_word_ids_enforces_exact_count(self):
-        body = self._wrap_content("[1]")
-        with self.assertRaises(RuntimeError):
-            self.parser.parse(
-                batch=self.batch,
-                response_body=body,
-                output_mode=ScoringOutputMode.SELECTED_WORD_IDS,
-                forced_rarity_level=1,
-                expected_items=2,
-            )
+        return _RESPONSE_TEMPLATE % json.dumps(content, ensure_ascii=False)
+
+    def test_selected_word_ids(self):
+        # (content, expected_items, expected word ids or None when parsing must fail)
+        cases = [
+            ("[1]", 1, [101]),
+            ("[999]", 1, None),
+            ("[1]", 2, None),
+        ]
+        for content, expected_items, expected_ids in cases:
+            with self.subTest(content=content, expected_items=expected_items):
+                kwargs = dict(
+                    batch=self.batch,
+                    response_body=self._wrap_content(content),
+                    output_mode=ScoringOutputMode.SELECTED_WORD_IDS,
+                    forced_rarity_level=1,
+                    expected_items=expected_items,
+                )
+                if expected_ids is None:
+                    with self.assertRaises(RuntimeError):
+                        self.parser.parse(**kwargs)
+                    continue
+                parsed = self.parser.parse(**kwargs)
+                self.assertEqual([s.word_id for s in parsed.scores], expected_ids)
+                self.assertEqual([s.rarity_level for s in parsed.scores], [1] * len(expected_ids))
 
 
 if __name__ == "__main__":
@@ -2,19 +2,32 @@ import tempfile
 import unittest
 from pathlib import Path
 
+from classificator.csv_codec import CsvRecord, CsvTable
 from classificator.run_csv_repository import RunCsvRepository
 from classificator.tools.review_low_confidence import (
+    ReviewItem,
     ReviewLabel,
+    _raise_first_invalid_item,
+    append_review_label,
     build_review_queue,
     compute_l1_review_stats,
+    load_latest_review_labels,
     load_review_items,
     parse_only_levels,
+    parse_review_items,
 )
 
 
 class ReviewLowConfidenceTest(unittest.TestCase):
-    def setUp(self):
-        self.repo = RunCsvRepository()
+    @classmethod
+    def setUpClass(cls):
+        cls.repo = RunCsvRepository()
+
+    def _tmp_root(self) -> Path:
+        # Only tests that write files pay for a temp dir.
+        td = tempfile.TemporaryDirectory()
+        self.addCleanup(td.cleanup)
+        return Path(td.name)
 
     def _write_csv(self, path: Path, headers: list[str], rows: list[list[str]]):
         self.repo.write_rows(path, headers, rows)
@@ -27,44 +40,44 @@ class ReviewLowConfidenceTest(unittest.TestCase):
         with self.assertRaises(ValueError):
             parse_only_levels("x")
 
-    def test_load_items_sorted_by_confidence(self):
-        with tempfile.TemporaryDirectory() as td:
-            root = Path(td)
-            path = root / "run.csv"
-            self._write_csv(
-                path,
-                ["word_id", "word", "type", "rarity_level", "confidence"],
-                [
-                    ["10", "cuvant10", "N", "1", "0.9"],
-                    ["11", "cuvant11", "N", "1", "0.2"],
-                    ["12", "cuvant12", "N", "4", "0.5"],
-                ],
-            )
-            items = load_review_items(csv_path=path, repo=self.repo, only_levels={1})
-            self.assertEqual([x.word_id for x in items], [11, 10])
+    def test_parse_items_sorted_by_confidence(self):
+        table = CsvTable(
+            headers=["word_id", "word", "type", "rarity_level", "confidence"],
+            records=[
+                CsvRecord(2, ["10", "cuvant10", "N", "1", "0.9"]),
+                CsvRecord(3, ["11", "cuvant11", "N", "1", "0.2"]),
+                CsvRecord(4, ["12", "cuvant12", "N", "4", "0.5"]),
+            ],
+        )
+        items = parse_review_items(table, csv_path=Path("run.csv"), only_levels={1})
+        self.assertEqual([x.word_id for x in items], [11, 10])
+
+    def test_invalid_item_rescan_always_raises(self):
+        records = [CsvRecord(2, ["10", "cuvant10", "N", "1", "0.9"])]
+        with self.assertRaisesRegex(ValueError, r"Invalid rows in run\.csv"):
+            _raise_first_invalid_item(records, Path("run.csv"), "rarity_level", "confidence", None, 0, 3, 4)
 
     def test_queue_skips_labeled_unless_undecided_enabled(self):
-        with tempfile.TemporaryDirectory() as td:
-            root = Path(td)
-            path = root / "run.csv"
-            self._write_csv(
-                path,
-                ["word_id", "word", "type", "rarity_level", "confidence"],
-                [
-                    ["1", "a", "N", "1", "0.1"],
-                    ["2", "b", "N", "1", "0.2"],
-                    ["3", "c", "N", "1", "0.3"],
-                ],
-            )
-            items = load_review_items(csv_path=path, repo=self.repo)
-            labels = {
-                1: ReviewLabel(word_id=1, predicted_level=1, label="1"),
-                2: ReviewLabel(word_id=2, predicted_level=1, label="undecided"),
-            }
-            queue_default = build_review_queue(items, labels, include_undecided=False)
-            self.assertEqual([x.word_id for x in queue_default], [3])
-            queue_with_undecided = build_review_queue(items, labels, include_undecided=True)
-            self.assertEqual([x.word_id for x in queue_with_undecided], [2, 3])
+        root = self._tmp_root()
+        path = root / "run.csv"
+        self._write_csv(
+            path,
+            ["word_id", "word", "type", "rarity_level", "confidence"],
+            [
+                ["1", "a", "N", "1", "0.1"],
+                ["2", "b", "N", "1", "0.2"],
+                ["3", "c", "N", "1", "0.3"],
+            ],
+        )
+        items = load_review_items(csv_path=path, repo=self.repo)
+        labels = {
+            1: ReviewLabel(word_id=1, predicted_level=1, label="1"),
+            2: ReviewLabel(word_id=2, predicted_level=1, label="undecided"),
+        }
+        queue_default = build_review_queue(items, labels, include_undecided=False)
+        self.assertEqual([x.word_id for x in queue_default], [3])
+        queue_with_undecided = build_review_queue(items, labels, include_undecided=True)
+        self.assertEqual([x.word_id for x in queue_with_undecided], [2, 3])
 
     def test_l1_stats_precision(self):
         labels = {
@@ -79,6 +92,15 @@ class ReviewLowConfidenceTest(unittest.TestCase):
         self.assertEqual(stats.accepted_level1, 1)
         self.assertAlmostEqual(stats.precision, 1 / 3)
 
+    def test_latest_labels_last_append_wins(self):
+        labels_csv = self._tmp_root() / "labels.csv"
+        self.assertEqual(load_latest_review_labels(labels_csv), {})
+        item = ReviewItem(word_id=7, word="om, rar", type="N", predicted_level=1, predicted_confidence=0.25)
+        append_review_label(labels_csv=labels_csv, run_csv=Path("run.csv"), item=item, label="undecided")
+        append_review_label(labels_csv=labels_csv, run_csv=Path("run.csv"), item=item, label="1")
+        latest = load_latest_review_labels(labels_csv)
+        self.assertEqual(latest, {7: ReviewLabel(word_id=7, predicted_level=1, label="1")})
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,53 +1,101 @@
+import io
 import tempfile
 import unittest
+from collections.abc import Iterator
+from contextlib import contextmanager
 from pathlib import Path
 
+from classificator.csv_codec import CsvCodec, CsvFormatError, CsvStream
 from classificator.run_csv_repository import RunCsvRepository
 
 
+class _InMemoryCodec(CsvCodec):
+    # Read-only codec over CSV text keyed by path, so parsing tests skip the disk.
+    def __init__(self, files: dict[Path, str]) -> None:
+        self.files = files
+
+    @contextmanager
+    def stream_table(self, path: Path) -> Iterator[CsvStream]:
+        yield self.stream_from(io.StringIO(self.files[path], newline=""), path)
+
+
 class RunCsvRepositoryTest(unittest.TestCase):
-    def setUp(self):
-        self.repo = RunCsvRepository()
+    @classmethod
+    def setUpClass(cls):
+        cls.repo = RunCsvRepository()
+
+    def _tmp_root(self) -> Path:
+        td = tempfile.TemporaryDirectory()
+        self.addCleanup(td.cleanup)
+        return Path(td.name)
 
     def test_load_final_levels_prefers_final_level(self):
-        with tempfile.TemporaryDirectory() as td:
-            path = Path(td) / "levels.csv"
-            self.repo.write_rows(
-                path,
-                ["word_id", "word", "type", "rarity_level", "final_level"],
-                [
-                    ["1", "om", "N", "5", "1"],
-                    ["2", "casă", "N", "4", "2"],
-                ],
+        path = Path("levels.csv")
+        repo = RunCsvRepository(
+            _InMemoryCodec(
+                {
+                    path: '"word_id","word","type","rarity_level","final_level"\r\n'
+                    '"1","om","N","5","1"\r\n'
+                    '"2","casă","N","4","2"\r\n'
+                }
             )
-            levels = self.repo.load_final_levels(path)
-            self.assertEqual(levels, {1: 1, 2: 2})
+        )
+        levels = repo.load_final_levels(path)
+        self.assertEqual(levels, {1: 1, 2: 2})
 
-    def test_load_run_rows_last_occurrence_wins(self):
-        with tempfile.TemporaryDirectory() as td:
-            path = Path(td) / "run.csv"
-            self.repo.write_rows(
-                path,
-                [
-                    "word_id",
-                    "word",
-                    "type",
-                    "rarity_level",
-                    "tag",
-                    "confidence",
-                    "scored_at",
-                    "model",
-                    "run_slug",
-                ],
-                [
-                    ["1", "om", "N", "3", "uncertain", "0.3", "t", "m", "r"],
-                    ["1", "om", "N", "1", "common", "0.9", "t2", "m", "r"],
-                ],
+    def test_load_final_levels_reports_out_of_range_line(self):
+        path = Path("levels.csv")
+        repo = RunCsvRepository(
+            _InMemoryCodec(
+                {
+                    path: '"word_id","word","final_level"\r\n'
+                    '"1","om, casă","1"\r\n'
+                    '"2","rar","6"\r\n'
+                }
             )
-            rows = self.repo.load_run_rows(path)
-            self.assertEqual(len(rows), 1)
-            self.assertEqual(rows[0].rarity_level, 1)
-            self.assertAlmostEqual(rows[0].confidence, 0.9)
+        )
+        with self.assertRaisesRegex(CsvFormatError, r"final_level out of range at .*:3"):
+            repo.load_final_levels(path)
+
+    def test_open_table_writer_keeps_target_on_error(self):
+        root = self._tmp_root()
+        path = root / "out.csv"
+        self.repo.write_rows(path, ["word_id"], [["1"]])
+        with self.assertRaises(CsvFormatError):
+            with self.repo.open_table_writer(path, ["word_id", "word"]) as sink:
+                sink.write(["2", "om"])
+                sink.write(["3"])
+        self.assertEqual(self.repo.read_table(path).headers, ["word_id"])
+        self.assertEqual([p.name for p in root.iterdir()], ["out.csv"])
+
+        with self.repo.open_table_writer(path, ["word_id", "word"]) as sink:
+            sink.write(["2", "om"])
+        self.assertEqual([r.values for r in self.repo.read_table(path).records], [["2", "om"]])
+
+    def test_load_run_rows_last_occurrence_wins(self):
+        path = self._tmp_root() / "run.csv"
+        self.repo.write_rows(
+            path,
+            [
+                "word_id",
+                "word",
+                "type",
+                "rarity_level",
+                "tag",
+                "confidence",
+                "scored_at",
+                "model",
+                "run_slug",
+            ],
+            [
+                ["1", "om", "N", "3", "uncertain", "0.3", "t", "m", "r"],
+                ["1", "om", "N", "1", "common", "0.9", "t2", "m", "r"],
+            ],
+        )
+        rows = self.repo.load_run_rows(path)
+        self.assertEqual(len(rows), 1)
+        self.assertEqual(rows[0].rarity_level, 1)
+        self.assertAlmostEqual(rows[0].confidence, 0.9)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,43 @@
+import random
+import unittest
+from collections import Counter
+
+from classificator.steps.step5_rebalance import RebalanceWord, _select_stratified_batch
+
+
+def _pools(available: dict[int, int]) -> dict[int, list[RebalanceWord]]:
+    return {
+        level: [RebalanceWord(word_id=level * 1000 + i, word=f"w{i}", type="N") for i in range(count)]
+        for level, count in available.items()
+    }
+
+
+class Step5BatchSelectionTest(unittest.TestCase):
+    def _level_mix(self, available: dict[int, int], initial: dict[int, int], max_batch_size: int) -> dict[int, int]:
+        batch = _select_stratified_batch(
+            source_levels=list(available),
+            remaining_by_source_level=_pools(available),
+            initial_source_counts=initial,
+            max_batch_size=max_batch_size,
+            rng=random.Random(7),
+        )
+        counts = Counter(word.word_id // 1000 for word in batch)
+        return {level: counts[level] for level in available}
+
+    def test_quotas_follow_initial_shares(self):
+        mix = self._level_mix({2: 30, 3: 30, 4: 30}, {2: 10, 3: 20, 4: 30}, 12)
+        self.assertEqual(mix, {2: 2, 3: 4, 4: 6})
+
+    def test_shortfall_is_spread_over_levels_with_most_spare(self):
+        # Quotas are 4/4/4 with level 4 empty; the 4 missing words go one at a time to
+        # the level with the most spare (10 vs 8), so they split 3/1, not 4/0.
+        mix = self._level_mix({2: 14, 3: 12, 4: 0}, {2: 10, 3: 10, 4: 10}, 12)
+        self.assertEqual(mix, {2: 7, 3: 5, 4: 0})
+
+    def test_shortfall_ties_go_to_earliest_level(self):
+        mix = self._level_mix({2: 10, 3: 10, 4: 0}, {2: 10, 3: 10, 4: 10}, 9)
+        self.assertEqual(mix, {2: 5, 3: 4, 4: 0})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,120 @@
+import tempfile
+import unittest
+from pathlib import Path
+
+from classificator.distribution import RarityDistribution
+from classificator.run_csv_repository import RunCsvRepository
+from classificator.steps.step5_rebalance import (
+    RebalanceRuntime,
+    Step5Logs,
+    SwitchedWordEvent,
+    _append_batch_checkpoint,
+    _load_dataset,
+    _restore_from_checkpoint,
+    _write_checkpoint_state,
+)
+from classificator.transitions import LevelTransition
+
+
+class Step5CheckpointStateTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        repo = RunCsvRepository()
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "in.csv"
+            repo.write_rows(
+                path,
+                ["word_id", "word", "type", "rarity_level"],
+                [[str(i), f"w{i}", "N", "2" if i <= 4 else "3"] for i in range(1, 9)],
+            )
+            # Restores only read the dataset; each runtime gets its own mutable distribution.
+            cls.dataset = _load_dataset(path, repo)
+        cls.levels = tuple(cls.dataset.levels_by_id.values())
+        cls.transition = LevelTransition(from_level=2, to_level=1)
+
+    def setUp(self):
+        td = tempfile.TemporaryDirectory()
+        self.addCleanup(td.cleanup)
+        self.root = Path(td.name)
+
+    def _mk_logs(self) -> Step5Logs:
+        return Step5Logs(
+            run_log_path=self.root / "run.jsonl",
+            failed_log_path=self.root / "failed.jsonl",
+            switched_words_log_path=self.root / "switched.jsonl",
+            checkpoint_path=self.root / "checkpoint.jsonl",
+            progress_log_path=self.root / "progress.jsonl",
+        )
+
+    def _mk_runtime(self) -> RebalanceRuntime:
+        return RebalanceRuntime(
+            levels_by_id=dict(self.dataset.levels_by_id),
+            distribution=RarityDistribution.from_levels(self.levels),
+            rebalance_rules={},
+            processed_word_ids=set(),
+        )
+
+    def _commit_batch(self, logs: Step5Logs, runtime: RebalanceRuntime, word_ids: list[int], switched_id: int) -> None:
+        rule = "2->1 (via 2:1)"
+        event = SwitchedWordEvent(switched_id, f"w{switched_id}", "N", 2, 1, rule, True)
+        runtime.processed_word_ids.update(word_ids)
+        runtime.levels_by_id[switched_id] = 1
+        runtime.rebalance_rules[switched_id] = rule
+        _append_batch_checkpoint(logs, self.transition, word_ids, [event], timestamp="2026-01-01T00:00:00+00:00")
+        runtime.checkpoint_batches += 1
+        logs.flush()
+
+    def _restore(self) -> tuple[RebalanceRuntime, tuple[int, int, int]]:
+        runtime = self._mk_runtime()
+        stats = _restore_from_checkpoint(self.dataset, runtime, self._mk_logs())
+        return runtime, (stats.resumed_batches, stats.resumed_processed_words, stats.resumed_switched_words)
+
+    def test_state_plus_tail_matches_full_replay(self):
+        with self._mk_logs() as logs:
+            runtime = self._mk_runtime()
+            self._commit_batch(logs, runtime, [1, 2], 1)
+            self._commit_batch(logs, runtime, [3], 3)
+            _write_checkpoint_state(logs, runtime)
+            self._commit_batch(logs, runtime, [4], 4)
+
+        from_state, from_state_stats = self._restore()
+        self._mk_logs().checkpoint_state_path.unlink()
+        replayed, replayed_stats = self._restore()
+
+        self.assertEqual(from_state_stats, (3, 4, 3))
+        self.assertEqual(from_state_stats, replayed_stats)
+        self.assertEqual(from_state.levels_by_id, replayed.levels_by_id)
+        self.assertEqual(from_state.rebalance_rules, replayed.rebalance_rules)
+        self.assertEqual(from_state.processed_word_ids, replayed.processed_word_ids)
+        self.assertEqual(from_state.distribution.format(), replayed.distribution.format())
+        self.assertEqual(from_state.checkpoint_batches, 3)
+
+    def test_state_is_ignored_when_checkpoint_was_replaced(self):
+        with self._mk_logs() as logs:
+            runtime = self._mk_runtime()
+            self._commit_batch(logs, runtime, [1, 2], 1)
+            _write_checkpoint_state(logs, runtime)
+        logs.checkpoint_path.unlink()
+        with self._mk_logs() as logs:
+            self._commit_batch(logs, self._mk_runtime(), [3, 4], 3)
+
+        restored, stats = self._restore()
+        self.assertEqual(stats, (1, 2, 1))
+        self.assertEqual(restored.processed_word_ids, {3, 4})
+        self.assertEqual(restored.rebalance_rules, {3: "2->1 (via 2:1)"})
+
+    def test_truncated_state_falls_back_to_replay(self):
+        with self._mk_logs() as logs:
+            runtime = self._mk_runtime()
+            self._commit_batch(logs, runtime, [1, 2], 1)
+            _write_checkpoint_state(logs, runtime)
+        state_path = logs.checkpoint_state_path
+        state_path.write_bytes(state_path.read_bytes()[:-8])
+
+        restored, stats = self._restore()
+        self.assertEqual(stats, (1, 2, 1))
+        self.assertEqual(restored.processed_word_ids, {1, 2})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import contextlib
+import hashlib
+import io
+import json
+import re
+import tempfile
+import time
+import unittest
+from pathlib import Path
+
+from classificator.models import LmApiFlavor, ResolvedEndpoint, ScoreResult
+from classificator.run_csv_repository import RunCsvRepository
+from classificator.steps.step5_rebalance import Step5Options, run_step5
+from classificator.transitions import LevelTransition
+
+_TIMESTAMP = re.compile(r"\d{4}-\d\d-\d\dT[0-9:.+]+")
+
+
+class _FakeLmClient:
+    # Picks common words by a stable hash and logs like the real client. Batches sleep
+    # for different times, so with workers they finish out of plan order.
+    def resolve_endpoint(self, endpoint_option, base_url_option):
+        return ResolvedEndpoint(
+            endpoint="http://lm", models_endpoint=None, flavor=LmApiFlavor.OPENAI_COMPAT, source="test"
+        )
+
+    def preflight(self, resolved_endpoint, model):
+        pass
+
+    def score_batch_resilient(self, batch, ctx):
+        time.sleep(0.001 * (batch[0].word_id % 3))
+        ranked = sorted(batch, key=lambda row: hashlib.md5(row.word.encode()).hexdigest())
+        with ctx.run_log_path.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps({"batch_word_ids": [row.word_id for row in batch]}) + "\n")
+        with ctx.failed_log_path.open("a", encoding="utf-8") as handle:
+            handle.write(json.dumps({"word_id": ranked[-1].word_id, "error": "test"}) + "\n")
+        ctx.notices.append(f"scored batch starting at {batch[0].word_id}")
+        return [
+            ScoreResult(row.word_id, row.word, row.type, ctx.forced_rarity_level, "common", 0.9)
+            for row in ranked[: ctx.expected_json_items]
+        ]
+
+
+class Step5ConcurrencyTest(unittest.TestCase):
+    def setUp(self):
+        td = tempfile.TemporaryDirectory()
+        self.addCleanup(td.cleanup)
+        self.root = Path(td.name)
+        self.repo = RunCsvRepository()
+        self.input_csv = self.root / "in.csv"
+        self.repo.write_rows(
+            self.input_csv,
+            ["word_id", "word", "type", "rarity_level"],
+            [[str(i), f"w{i}", "N", "2" if i % 3 else "1"] for i in range(1, 121)],
+        )
+
+    def _run(self, max_concurrency: int) -> dict[str, str]:
+        out_dir = self.root / f"c{max_concurrency}"
+        options = Step5Options(
+            run_slug="rb",
+            model="m",
+            input_csv_path=self.input_csv,
+            output_csv_path=out_dir / "out.csv",
+            batch_size=10,
+            lower_ratio=0.3,
+            max_concurrency=max_concurrency,
+            skip_preflight=True,
+            seed=5,
+            transitions=[LevelTransition(from_level=2, to_level=1)],
+        )
+        stdout = io.StringIO()
+        with contextlib.redirect_stdout(stdout):
+            run_step5(options, repo=self.repo, lm_client=_FakeLmClient(), output_dir=out_dir / "logs")
+        files = [out_dir / "out.csv", *sorted(out_dir.rglob("*.jsonl"))]
+        outputs = {str(p.relative_to(out_dir)): _TIMESTAMP.sub("TS", p.read_text(encoding="utf-8")) for p in files}
+        # Everything but the run header, which echoes maxConcurrency; paths differ per run.
+        outputs["stdout"] = "".join(
+            line for line in stdout.getvalue().splitlines(keepends=True) if "maxConcurrency=" not in line
+        ).replace(str(out_dir), "OUT")
+        return outputs
+
+    def test_concurrent_run_matches_sequential_run(self):
+        sequential = self._run(1)
+        concurrent = self._run(2)
+        self.assertEqual(concurrent.keys(), sequential.keys())
+        self.assertFalse([name for name in sequential if ".batch" in name])
+        for name, content in sequential.items():
+            with self.subTest(name=name):
+                self.assertEqual(concurrent[name], content)
+        self.assertEqual(sequential["logs/rebalance/failed_batches/rb.failed.jsonl"].count("\n"), 8)
+        self.assertEqual(sequential["stdout"].count("scored batch starting at"), 8)
+
+
+if __name__ == "__main__":
+    unittest.main()
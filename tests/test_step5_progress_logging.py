@@ -14,7 +14,30 @@ from classificator.steps.step5_rebalance import (
 from classificator.transitions import LevelTransition
 
 
+def _read_log_row(path: Path) -> dict[str, object]:
+    # First JSONL record only, as raw bytes; later batches may append more lines.
+    with path.open("rb") as handle:
+        return json.loads(handle.readline())
+
+
+def _fields(row: dict[str, object], expected: dict[str, object]) -> dict[str, object]:
+    # Projects the row onto the expected keys so one assertEqual covers them all;
+    # a missing key shows up as None in the diff instead of a KeyError.
+    return {key: row.get(key) for key in expected}
+
+
 class Step5ProgressLoggingTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.levels = {1: 4, 2: 4, 3: 5}
+        # Progress logging only reads the distribution, so one instance serves every test.
+        cls.distribution = RarityDistribution.from_levels(cls.levels.values())
+
+    def setUp(self):
+        td = tempfile.TemporaryDirectory()
+        self.addCleanup(td.cleanup)
+        self.root = Path(td.name)
+
     def _mk_logs(self, root: Path) -> Step5Logs:
         return Step5Logs(
             run_log_path=root / "run.jsonl",
@@ -25,95 +48,94 @@ class Step5ProgressLoggingTest(unittest.TestCase):
         )
 
     def _mk_runtime(self) -> RebalanceRuntime:
-        levels = {1: 4, 2: 4, 3: 5}
         return RebalanceRuntime(
-            levels_by_id=dict(levels),
-            distribution=RarityDistribution.from_levels(list(levels.values())),
+            levels_by_id=dict(self.levels),
+            distribution=self.distribution,
             rebalance_rules={},
             processed_word_ids=set(),
         )
 
     def test_progress_logs_picked_target_words_when_target_is_common(self):
-        with tempfile.TemporaryDirectory() as td:
-            root = Path(td)
-            logs = self._mk_logs(root)
-            runtime = self._mk_runtime()
-            options = Step5Options(
-                run_slug="rb_test",
-                model="m",
-                input_csv_path=root / "in.csv",
-                output_csv_path=root / "out.csv",
-            )
-            transition = LevelTransition(from_level=4, to_level=4)
-            batch = [
-                RebalanceWord(word_id=1, word="a", type="N"),
-                RebalanceWord(word_id=2, word="b", type="N"),
-            ]
-            _append_batch_progress(
-                logs=logs,
-                options=options,
-                transition=transition,
-                batch_index=1,
-                batch=batch,
-                selected_common_word_ids={2},
-                common_level=4,
-                processed=2,
-                eligible_count=10,
-                target_assigned=1,
-                expected_target_total=5,
-                batch_target=1,
-                batch_mix="[4:2]",
-                runtime=runtime,
-            )
-            row = json.loads(logs.progress_log_path.read_text(encoding="utf-8").strip())
-            self.assertEqual(row["picked_target_level"], 4)
-            self.assertEqual(row["picked_target_word_ids"], [2])
-            self.assertEqual(row["picked_target_words"], ["b"])
-            self.assertEqual(row["remaining"], 8)
-            run_row = json.loads(logs.run_log_path.read_text(encoding="utf-8").strip())
-            self.assertEqual(run_row["event"], "batch_progress")
-            self.assertEqual(run_row["batch_index"], 1)
+        root = self.root
+        logs = self._mk_logs(root)
+        runtime = self._mk_runtime()
+        options = Step5Options(
+            run_slug="rb_test",
+            model="m",
+            input_csv_path=root / "in.csv",
+            output_csv_path=root / "out.csv",
+        )
+        transition = LevelTransition(from_level=4, to_level=4)
+        batch = [
+            RebalanceWord(word_id=1, word="a", type="N"),
+            RebalanceWord(word_id=2, word="b", type="N"),
+        ]
+        _append_batch_progress(
+            logs=logs,
+            options=options,
+            transition=transition,
+            batch_index=1,
+            batch=batch,
+            selected_common_word_ids={2},
+            common_level=4,
+            processed=2,
+            eligible_count=10,
+            target_assigned=1,
+            expected_target_total=5,
+            batch_target=1,
+            batch_mix="[4:2]",
+            runtime=runtime,
+            timestamp="2026-01-01T00:00:00+00:00",
+        )
+        logs.close()
+        expected = {
+            "picked_target_level": 4,
+            "picked_target_word_ids": [2],
+            "picked_target_words": ["b"],
+            "remaining": 8,
+        }
+        self.assertEqual(_fields(_read_log_row(logs.progress_log_path), expected), expected)
+        expected_run = {"event": "batch_progress", "batch_index": 1}
+        self.assertEqual(_fields(_read_log_row(logs.run_log_path), expected_run), expected_run)
 
     def test_progress_logs_picked_target_words_when_target_is_rare(self):
-        with tempfile.TemporaryDirectory() as td:
-            root = Path(td)
-            logs = self._mk_logs(root)
-            runtime = self._mk_runtime()
-            options = Step5Options(
-                run_slug="rb_test",
-                model="m",
-                input_csv_path=root / "in.csv",
-                output_csv_path=root / "out.csv",
-            )
-            transition = LevelTransition(from_level=2, from_level_upper=3, to_level=3)
-            batch = [
-                RebalanceWord(word_id=1, word="a", type="N"),
-                RebalanceWord(word_id=2, word="b", type="N"),
-                RebalanceWord(word_id=3, word="c", type="N"),
-            ]
-            _append_batch_progress(
-                logs=logs,
-                options=options,
-                transition=transition,
-                batch_index=2,
-                batch=batch,
-                selected_common_word_ids={1, 3},
-                common_level=2,
-                processed=3,
-                eligible_count=20,
-                target_assigned=1,
-                expected_target_total=6,
-                batch_target=1,
-                batch_mix="[2:2 3:1]",
-                runtime=runtime,
-            )
-            row = json.loads(logs.progress_log_path.read_text(encoding="utf-8").strip())
-            self.assertEqual(row["picked_target_level"], 3)
-            self.assertEqual(row["picked_target_word_ids"], [2])
-            self.assertEqual(row["picked_target_words"], ["b"])
-            run_row = json.loads(logs.run_log_path.read_text(encoding="utf-8").strip())
-            self.assertEqual(run_row["event"], "batch_progress")
-            self.assertEqual(run_row["picked_target_level"], 3)
+        root = self.root
+        logs = self._mk_logs(root)
+        runtime = self._mk_runtime()
+        options = Step5Options(
+            run_slug="rb_test",
+            model="m",
+            input_csv_path=root / "in.csv",
+            output_csv_path=root / "out.csv",
+        )
+        transition = LevelTransition(from_level=2, from_level_upper=3, to_level=3)
+        batch = [
+            RebalanceWord(word_id=1, word="a", type="N"),
+            RebalanceWord(word_id=2, word="b", type="N"),
+            RebalanceWord(word_id=3, word="c", type="N"),
+        ]
+        _append_batch_progress(
+            logs=logs,
+            options=options,
+            transition=transition,
+            batch_index=2,
+            batch=batch,
+            selected_common_word_ids={1, 3},
+            common_level=2,
+            processed=3,
+            eligible_count=20,
+            target_assigned=1,
+            expected_target_total=6,
+            batch_target=1,
+            batch_mix="[2:2 3:1]",
+            runtime=runtime,
+            timestamp="2026-01-01T00:00:00+00:00",
+        )
+        logs.close()
+        expected = {"picked_target_level": 3, "picked_target_word_ids": [2], "picked_target_words": ["b"]}
+        self.assertEqual(_fields(_read_log_row(logs.progress_log_path), expected), expected)
+        expected_run = {"event": "batch_progress", "picked_target_level": 3}
+        self.assertEqual(_fields(_read_log_row(logs.run_log_path), expected_run), expected_run)
 
 
 if __name__ == "__main__":
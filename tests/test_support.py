@@ -0,0 +1,52 @@
+import itertools
+import unittest
+from pathlib import Path
+
+from classificator.support import median, parse_digit_column, parse_id_level_columns
+
+
+class MedianTest(unittest.TestCase):
+    def test_small_inputs_match_sorted_median(self):
+        for n in range(1, 6):
+            for values in itertools.product(range(1, 6), repeat=n):
+                ordered = sorted(values)
+                mid = n // 2
+                expected = ordered[mid] if n % 2 else round((ordered[mid - 1] + ordered[mid]) / 2.0)
+                # A message instead of subTest: thousands of subTest contexts dominated suite time.
+                self.assertEqual(median(list(values)), expected, values)
+
+    def test_rejects_empty(self):
+        with self.assertRaises(ValueError):
+            median([])
+
+
+class ParseDigitColumnTest(unittest.TestCase):
+    def test_single_digit_cells_are_decoded(self):
+        self.assertEqual(list(parse_digit_column(["1", "5", "0", "3"])), [1, 5, 0, 3])
+
+    def test_other_cells_need_int(self):
+        for values in (["1", "12"], ["", "12"], ["1", " 2"], ["x"], ["\u0663"]):
+            with self.subTest(values=values):
+                self.assertIsNone(parse_digit_column(values))
+
+
+class ParseIdLevelColumnsTest(unittest.TestCase):
+    def test_parses_id_and_level_columns(self):
+        rows = [["10", "w", "1"], ["11", "w", "5"], ["12", "w", " 3"]]
+        word_ids, levels = parse_id_level_columns(rows, 0, 2, source=Path("in.csv"), raise_first_invalid=self.fail)
+        self.assertEqual((word_ids, list(levels)), ([10, 11, 12], [1, 5, 3]))
+
+    def test_bad_cells_always_raise(self):
+        calls = []
+        for rows in ([["x", "1"]], [["1", "x"]], [["1", "6"]], [["1", "0"]]):
+            with self.subTest(rows=rows):
+                # The reporter returning normally must not let the columns through.
+                with self.assertRaisesRegex(ValueError, r"Invalid word_id/level values in in\.csv"):
+                    parse_id_level_columns(
+                        rows, 0, 1, source=Path("in.csv"), raise_first_invalid=lambda: calls.append(1)
+                    )
+        self.assertEqual(len(calls), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
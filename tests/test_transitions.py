@@ -28,6 +28,16 @@ class TransitionsTest(unittest.TestCase):
         with self.assertRaises(ValueError):
             validate_transition_set(transitions)
 
+    def test_validate_transition_overlap_lists_each_level_once(self):
+        transitions = [
+            LevelTransition(from_level=3, to_level=3, from_level_upper=4),
+            LevelTransition(from_level=2, to_level=2, from_level_upper=3),
+            LevelTransition(from_level=3, to_level=2),
+            LevelTransition(from_level=1, to_level=1),
+        ]
+        with self.assertRaisesRegex(ValueError, r"overlap source levels: 3$"):
+            validate_transition_set(transitions)
+
     def test_valid_transition_guards(self):
         require_valid_transition(3, 2)
         require_valid_transition(2, 2)
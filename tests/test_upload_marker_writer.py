@@ -0,0 +1,83 @@
+import tempfile
+import unittest
+from pathlib import Path
+from unittest import mock
+
+from classificator import csv_codec
+from classificator.run_csv_repository import RunCsvRepository
+from classificator.upload_marker_writer import UploadMarkerWriter
+
+
+class UploadMarkerWriterTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.repo = RunCsvRepository()
+        cls.writer = UploadMarkerWriter(cls.repo)
+
+    def test_marks_rows_in_place_and_keeps_previous_markers(self):
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "final.csv"
+            self.repo.write_rows(
+                path,
+                ["word_id", "word", "final_level", "upload_status"],
+                [["1", "om, casă", "1", ""], ["2", "rar", "5", "uploaded"], ["x", "bad", "3", ""]],
+            )
+            result = self.writer.mark_uploaded_rows(
+                final_csv_path=path,
+                uploaded_levels={1: 1},
+                status_by_word_id={1: "uploaded"},
+                upload_batch_id="b1",
+                uploaded_at="t1",
+            )
+            table = self.repo.read_table(path)
+
+        self.assertFalse(result.used_companion_file)
+        self.assertEqual(result.marked_rows, 1)
+        self.assertEqual(
+            table.headers,
+            ["word_id", "word", "final_level", "upload_status", "uploaded_at", "uploaded_level", "upload_batch_id"],
+        )
+        self.assertEqual(
+            [r.values for r in table.records],
+            [
+                ["1", "om, casă", "1", "uploaded", "t1", "1", "b1"],
+                ["2", "rar", "5", "uploaded", "", "", ""],
+                ["x", "bad", "3", "", "", "", ""],
+            ],
+        )
+
+    def test_falls_back_to_companion_without_leaving_temp_file(self):
+        with tempfile.TemporaryDirectory() as td:
+            path = Path(td) / "final.csv"
+            self.repo.write_rows(path, ["word_id", "word"], [["1", "om"], ["2", "rar"]])
+            real_replace = csv_codec.os.replace
+
+            def replace(src, dst):
+                if Path(dst) == path:
+                    raise PermissionError(dst)
+                real_replace(src, dst)
+
+            with mock.patch.object(csv_codec.os, "replace", side_effect=replace):
+                result = self.writer.mark_uploaded_rows(
+                    final_csv_path=path,
+                    uploaded_levels={1: 2},
+                    status_by_word_id={1: "uploaded"},
+                    upload_batch_id="b1",
+                    uploaded_at="t1",
+                )
+            names = sorted(p.name for p in Path(td).iterdir())
+            original = self.repo.read_table(path)
+            companion = self.repo.read_table(result.marker_path)
+
+        self.assertTrue(result.used_companion_file)
+        self.assertEqual(result.marked_rows, 1)
+        self.assertEqual(names, ["final.csv", "final.csv.upload_markers.csv"])
+        self.assertEqual(original.headers, ["word_id", "word"])
+        self.assertEqual(
+            [r.values for r in companion.records],
+            [["1", "t1", "2", "uploaded", "b1"]],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,12 +1,15 @@
 import unittest
-from unittest.mock import MagicMock
+from contextlib import nullcontext
+from types import SimpleNamespace
+from unittest import mock
 
+from classificator import word_store
 from classificator.word_store import WordStore
 
 
 class _FakeCursor:
     def __init__(self):
-        self.executemany_calls: list[tuple[str, list[tuple[int, int]]]] = []
+        self.execute_calls: list[tuple[str, tuple[list[int], list[int]]]] = []
 
     def __enter__(self):
         return self
@@ -14,14 +17,34 @@ class _FakeCursor:
     def __exit__(self, exc_type, exc, tb):
         return False
 
-    def executemany(self, sql: str, payload: list[tuple[int, int]]) -> None:
-        self.executemany_calls.append((sql, payload))
+    def execute(self, sql: str, params: tuple[list[int], list[int]]) -> None:
+        self.execute_calls.append((sql, params))
+
+
+class _FakeServerCursor:
+    def __init__(self, rows):
+        self.rows = rows
+        self.itersize = 100
+        self.sql = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+    def execute(self, sql: str) -> None:
+        self.sql = sql
+
+    def __iter__(self):
+        return iter(self.rows)
 
 
 class _FakeConnection:
     def __init__(self, cursor: _FakeCursor):
         self._cursor = cursor
         self.commit_calls = 0
+        self.pipeline_calls = 0
 
     def __enter__(self):
         return self
@@ -29,54 +52,83 @@ class _FakeConnection:
     def __exit__(self, exc_type, exc, tb):
         return False
 
-    def cursor(self):
+    def cursor(self, name=None):
+        self.cursor_name = name
         return self._cursor
 
     def commit(self) -> None:
         self.commit_calls += 1
 
+    def pipeline(self):
+        self.pipeline_calls += 1
+        return nullcontext()
+
 
 class WordStoreTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.store = WordStore(db_url="postgresql://example.invalid/db", db_user="u", db_password="p")
+
+    def setUp(self):
+        # Tests swap in their own _connect; drop it afterwards so the shared store stays clean.
+        self.addCleanup(vars(self.store).pop, "_connect", None)
+
     def test_update_rarity_levels_chunked_updates_only_rarity_column(self):
-        store = WordStore(db_url="postgresql://example.invalid/db", db_user="u", db_password="p")
-        fake_cursor = _FakeCursor()
+        store = self.store
+        # Ids deliberately out of order: chunks must follow dict insertion order.
+        updates = {103: 1, 101: 2, 105: 4, 102: 5, 104: 3}
+        pairs = list(updates.items())
+        for chunk_size in (1, 2, 3, len(updates), 1000):
+            expected_params = [
+                ([word_id for word_id, _ in chunk], [level for _, level in chunk])
+                for chunk in (pairs[i : i + chunk_size] for i in range(0, len(pairs), chunk_size))
+            ]
+            with self.subTest(chunk_size=chunk_size):
+                fake_cursor = _FakeCursor()
+                fake_conn = _FakeConnection(fake_cursor)
+                store._connect = lambda: fake_conn
+
+                store.update_rarity_levels_chunked(updates, chunk_size=chunk_size)
+
+                self.assertEqual(fake_conn.commit_calls, 1)
+                statements = {sql for sql, _ in fake_cursor.execute_calls}
+                self.assertEqual(len(statements), 1)
+                self.assertRegex(
+                    statements.pop(),
+                    r"^UPDATE words SET rarity_level = v\.rarity_level FROM unnest\(.*WHERE words\.id = v\.id$",
+                )
+                self.assertEqual([params for _, params in fake_cursor.execute_calls], expected_params)
+
+    def test_update_rarity_levels_chunked_uses_pipeline_when_supported(self):
+        store = self.store
+        fake_conn = _FakeConnection(_FakeCursor())
+        store._connect = lambda: fake_conn
+
+        for supported, expected_calls in ((False, 0), (True, 1)):
+            pipeline = SimpleNamespace(is_supported=lambda supported=supported: supported)
+            with mock.patch.object(word_store, "_Pipeline", pipeline):
+                store.update_rarity_levels_chunked({1: 2}, chunk_size=2)
+            self.assertEqual(fake_conn.pipeline_calls, expected_calls)
+
+    def test_fetch_all_word_levels_streams_from_named_cursor(self):
+        store = self.store
+        fake_cursor = _FakeServerCursor([(1, 3), (2, 5)])
         fake_conn = _FakeConnection(fake_cursor)
-        store._connect = MagicMock(return_value=fake_conn)
-
-        updates = {
-            101: 2,
-            102: 5,
-            103: 1,
-        }
-        store.update_rarity_levels_chunked(updates, chunk_size=2)
-
-        self.assertEqual(fake_conn.commit_calls, 1)
-        self.assertEqual(len(fake_cursor.executemany_calls), 2)
-        self.assertEqual(
-            fake_cursor.executemany_calls[0],
-            (
-                "UPDATE words SET rarity_level = %s WHERE id = %s",
-                [(2, 101), (5, 102)],
-            ),
-        )
-        self.assertEqual(
-            fake_cursor.executemany_calls[1],
-            (
-                "UPDATE words SET rarity_level = %s WHERE id = %s",
-                [(1, 103)],
-            ),
-        )
-        for _, payload in fake_cursor.executemany_calls:
-            for item in payload:
-                self.assertEqual(len(item), 2)
+        store._connect = lambda: fake_conn
 
-    def test_update_rarity_levels_chunked_empty_updates_does_not_connect(self):
-        store = WordStore(db_url="postgresql://example.invalid/db", db_user="u", db_password="p")
-        store._connect = MagicMock()
+        levels = list(store.fetch_all_word_levels())
 
-        store.update_rarity_levels_chunked({}, chunk_size=2)
+        self.assertEqual([(wl.word_id, wl.rarity_level) for wl in levels], [(1, 3), (2, 5)])
+        self.assertEqual(fake_conn.cursor_name, "fetch_all_word_levels")
+        self.assertGreater(fake_cursor.itersize, 100)
+        self.assertEqual(fake_cursor.sql, "SELECT id, rarity_level FROM words ORDER BY id")
+
+    def test_update_rarity_levels_chunked_empty_updates_does_not_connect(self):
+        def connect():
+            self.fail("empty updates must not open a connection")
 
-        store._connect.assert_not_called()
+        self.store._connect = connect
+        self.store.update_rarity_levels_chunked({}, chunk_size=2)
 
 
 if __name__ == "__main__":